@@ -1,11 +1,13 @@
 # Alternative TTS implementations for different providers
 
 import os
-import uuid
+import asyncio
+import functools
 import requests
-from pathlib import Path
 from typing import Optional
 
+from audio_cache import cache_key, get_audio_cache
+
 # Optional imports for different TTS providers
 try:
     import elevenlabs
@@ -21,6 +23,7 @@ except ImportError:
 
 try:
     import boto3
+    from botocore.config import Config
     AWS_POLLY_AVAILABLE = True
 except ImportError:
     AWS_POLLY_AVAILABLE = False
@@ -52,6 +55,13 @@ class ElevenLabsTTS:
             
             voice_id = voice_map.get(language, voice_map["en-US"])
             
+            # Reuse previously synthesized audio for identical requests
+            audio_cache = get_audio_cache()
+            key = cache_key(text, voice_id, language, "", "")
+            cached_url = audio_cache.lookup(key, ".mp3")
+            if cached_url:
+                return cached_url
+            
             # Generate audio
             audio = elevenlabs.generate(
                 text=text,
@@ -60,13 +70,7 @@ class ElevenLabsTTS:
             )
             
             # Save to file
-            audio_filename = f"narration_{uuid.uuid4().hex}.mp3"
-            audio_path = Path("static") / audio_filename
-            
-            with open(audio_path, "wb") as f:
-                f.write(audio)
-            
-            return f"/static/{audio_filename}"
+            return await audio_cache.store(key, ".mp3", audio)
             
         except Exception as e:
             print(f"ElevenLabs TTS Error: {e}")
@@ -95,6 +99,13 @@ class GoogleTTS:
             
             voice_config = voice_map.get(language, voice_map["en-US"])
             
+            # Reuse previously synthesized audio for identical requests
+            audio_cache = get_audio_cache()
+            key = cache_key(text, voice_config["name"], language, "0.9", "2.0")
+            cached_url = audio_cache.lookup(key, ".mp3")
+            if cached_url:
+                return cached_url
+            
             synthesis_input = texttospeech.SynthesisInput(text=text)
             voice = texttospeech.VoiceSelectionParams(
                 language_code=language,
@@ -114,13 +125,7 @@ class GoogleTTS:
             )
             
             # Save to file
-            audio_filename = f"narration_{uuid.uuid4().hex}.mp3"
-            audio_path = Path("static") / audio_filename
-            
-            with open(audio_path, "wb") as f:
-                f.write(response.audio_content)
-            
-            return f"/static/{audio_filename}"
+            return await audio_cache.store(key, ".mp3", response.audio_content)
             
         except Exception as e:
             print(f"Google TTS Error: {e}")
@@ -137,7 +142,15 @@ class AWSPollyTTS:
         self.polly = boto3.client('polly',
             aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
             aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION', 'us-east-1')
+            region_name=os.getenv('AWS_REGION', 'us-east-1'),
+            # Keep connections warm so repeat calls skip the TCP/TLS handshake
+            config=Config(
+                tcp_keepalive=True,
+                max_pool_connections=50,
+                connect_timeout=3,
+                read_timeout=10,
+                retries={'total_max_attempts': 2, 'mode': 'standard'}
+            )
         )
     
     async def synthesize_speech(self, text: str, language: str = "en-US") -> Optional[str]:
@@ -156,6 +169,13 @@ class AWSPollyTTS:
             
             voice_id = voice_map.get(language, "Joanna")
             
+            # Reuse previously synthesized audio for identical requests
+            audio_cache = get_audio_cache()
+            key = cache_key(text, voice_id, language, "90%", "+10%")
+            cached_url = audio_cache.lookup(key, ".mp3")
+            if cached_url:
+                return cached_url
+            
             # SSML for child-friendly speech
             ssml_text = f"""
             <speak>
@@ -172,14 +192,9 @@ class AWSPollyTTS:
                 VoiceId=voice_id
             )
             
-            # Save to file
-            audio_filename = f"narration_{uuid.uuid4().hex}.mp3"
-            audio_path = Path("static") / audio_filename
-            
-            with open(audio_path, "wb") as f:
-                f.write(response['AudioStream'].read())
-            
-            return f"/static/{audio_filename}"
+            # Collect the audio stream in memory off the event loop, then save to file
+            audio = await asyncio.to_thread(response['AudioStream'].read)
+            return await audio_cache.store(key, ".mp3", audio)
             
         except Exception as e:
             print(f"AWS Polly TTS Error: {e}")
@@ -196,8 +211,9 @@ class FallbackTTS:
 
 
 # TTS Provider factory
+@functools.lru_cache(maxsize=None)
 def get_tts_provider(provider: str = "azure"):
-    """Get TTS provider based on configuration"""
+    """Get TTS provider based on configuration (one shared instance per provider)"""
     
     if provider == "azure":
         # Use the main Azure implementation from main.py
@@ -0,0 +1,222 @@
+"""
+Audio Cache
+Content-addressed storage for synthesized narration audio in the static directory
+
+Files are named after a BLAKE2b digest of their bytes, so identical audio is
+stored once; the index maps each request key to the file that answers it.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiofiles
+import aiofiles.os
+
+
+STATIC_DIR = Path("static")
+INDEX_FILENAME = "_index.json"
+AUDIO_EXTENSIONS = (".wav", ".mp3")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+
+def cache_key(text: str, voice: str, language: str, rate: str, pitch: str) -> str:
+    """Build a stable cache key for one synthesis request"""
+    payload = "\x1f".join((text, voice, language, rate, pitch))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def content_filename(data: bytes, extension: str) -> str:
+    """Name a file after a digest of its contents"""
+    return f"{hashlib.blake2b(data, digest_size=16).hexdigest()}{extension}"
+
+
+class AudioCache:
+    """Size-bounded LRU cache of audio files, tracked by a persisted index"""
+
+    def __init__(self, static_dir: Path = STATIC_DIR, max_bytes: Optional[int] = None):
+        self.static_dir = static_dir
+        self.static_dir.mkdir(exist_ok=True)
+        if max_bytes is None:
+            max_bytes = int(os.getenv("AUDIO_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.max_bytes = max_bytes
+        # Plain string paths on the hot lookup/store path instead of per-call Path objects
+        self._static = os.fspath(static_dir)
+        self._index_path = os.path.join(self._static, INDEX_FILENAME)
+        # filename -> [size, atime], least recently used first
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        # request key + extension -> content filename
+        self._keys: Dict[str, str] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def _load_index(self):
+        """Load the index from disk, rebuilding it from a directory scan if missing"""
+        try:
+            with open(self._index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+
+        if "files" not in index:
+            # Missing or pre-dedup index: rebuild from a directory scan. Older
+            # files were named after their request key, so they map to themselves.
+            files = {}
+            for extension in AUDIO_EXTENSIONS:
+                for file_path in self.static_dir.glob(f"*{extension}"):
+                    stat = file_path.stat()
+                    files[file_path.name] = [stat.st_size, stat.st_mtime]
+            index = {"files": files, "keys": {name: name for name in files}}
+
+        for filename, (size, atime) in sorted(index["files"].items(), key=lambda item: item[1][1]):
+            if os.path.exists(os.path.join(self._static, filename)):
+                self._entries[filename] = [size, atime]
+                self._total_bytes += size
+
+        self._keys = {
+            request: filename
+            for request, filename in index.get("keys", {}).items()
+            if filename in self._entries
+        }
+
+        self._save_index()
+
+    def _save_index(self):
+        """Persist the index atomically"""
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"files": self._entries, "keys": self._keys}, f)
+        os.replace(tmp_path, self._index_path)
+
+    def lookup(self, key: str, extension: str) -> Optional[str]:
+        """Return the URL of a cached file, or None on a miss"""
+        filename = self._lookup_filename(key, extension)
+        return f"/static/{filename}" if filename else None
+
+    def lookup_path(self, key: str, extension: str) -> Optional[str]:
+        """Return the path of a cached file, or None on a miss"""
+        filename = self._lookup_filename(key, extension)
+        return os.path.join(self._static, filename) if filename else None
+
+    def _lookup_filename(self, key: str, extension: str) -> Optional[str]:
+        """Resolve a request key to its content filename and mark it as recently used"""
+        with self._lock:
+            filename = self._keys.get(f"{key}{extension}")
+            entry = self._entries.get(filename) if filename else None
+            if entry is None:
+                return None
+
+        exists = os.path.exists(os.path.join(self._static, filename))
+
+        with self._lock:
+            if filename not in self._entries:
+                return None
+            if not exists:
+                # Removed behind our back
+                self._total_bytes -= entry[0]
+                del self._entries[filename]
+                self._drop_keys({filename})
+                return None
+
+            entry[1] = time.time()
+            self._entries.move_to_end(filename)
+
+        return filename
+
+    async def store(self, key: str, extension: str, data: bytes) -> str:
+        """Write synthesized audio to the cache without blocking the event loop and return its URL"""
+        filename = content_filename(data, extension)
+        file_path = os.path.join(self._static, filename)
+
+        # Identical audio is already on disk under the same name
+        if not await aiofiles.os.path.exists(file_path):
+            # Unique temp name: concurrent stores of the same audio must not share an inode
+            tmp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+            try:
+                async with aiofiles.open(tmp_path, "wb") as f:
+                    await f.write(data)
+                await aiofiles.os.replace(tmp_path, file_path)
+            except OSError:
+                # Fine if a concurrent store already published the same content
+                if not await aiofiles.os.path.exists(file_path):
+                    raise
+                try:
+                    await aiofiles.os.remove(tmp_path)
+                except OSError:
+                    pass
+
+        # Eviction and the index write touch the disk too
+        await asyncio.to_thread(self._add, f"{key}{extension}", filename, len(data))
+        return f"/static/{filename}"
+
+    def _add(self, request: str, filename: str, size: int):
+        """Register a stored file and evict old entries past the size cap"""
+        with self._lock:
+            self._keys[request] = filename
+            previous = self._entries.pop(filename, None)
+            if previous is not None:
+                self._total_bytes -= previous[0]
+            self._entries[filename] = [size, time.time()]
+            self._total_bytes += size
+            self._evict()
+            self._save_index()
+
+    def enforce_cap(self) -> int:
+        """Evict least recently used files until the cache fits its cap"""
+        with self._lock:
+            evicted = self._evict()
+            if evicted:
+                self._save_index()
+            return evicted
+
+    def _evict(self) -> int:
+        """Drop least recently used files; caller must hold the lock"""
+        evicted = set()
+        # Always keep the newest file, even if it alone exceeds the cap
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            filename, (size, _) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.unlink(os.path.join(self._static, filename))
+            except FileNotFoundError:
+                pass
+            evicted.add(filename)
+        if evicted:
+            self._drop_keys(evicted)
+        return len(evicted)
+
+    def _drop_keys(self, filenames: set):
+        """Forget request keys pointing at removed files; caller must hold the lock"""
+        self._keys = {
+            request: filename
+            for request, filename in self._keys.items()
+            if filename not in filenames
+        }
+
+    def get_stats(self) -> dict:
+        """Get current cache usage"""
+        with self._lock:
+            return {
+                'files': len(self._entries),
+                'keys': len(self._keys),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+# Global instance
+_audio_cache = None
+
+def get_audio_cache() -> AudioCache:
+    """Get the global audio cache instance"""
+    global _audio_cache
+    if _audio_cache is None:
+        _audio_cache = AudioCache()
+    return _audio_cache
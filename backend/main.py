@@ -1,17 +1,22 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import tempfile
 import os
-import json
 import re
-from typing import Optional, Dict, Any
+import hashlib
+import contextlib
+import orjson
+import aiofiles
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
 import asyncio
 from pathlib import Path
-import uuid
 import time
+import wave
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 
 # For image processing
 from PIL import Image
@@ -20,7 +25,15 @@ import io
 
 # For LLM integration (using OpenAI as example)
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI
+import httpx
+
+# For safety word filtering
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
 
 # For TTS (using Azure Speech Services as example)
 import azure.cognitiveservices.speech as speechsdk
@@ -32,10 +45,14 @@ load_dotenv()
 # Import Tobii eye tracking service
 from tobii_eye_tracking_service import get_tobii_eye_tracking_service
 
+# Import audio cache
+from audio_cache import cache_key, get_audio_cache
+
 app = FastAPI(
     title="GlimmerRead - Child Reading Assistant",
     description="AI-powered reading assistant for children's picture books",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -45,6 +62,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Narration-Text"],
 )
 
 # Create necessary directories
@@ -52,19 +70,159 @@ TEMP_DIR = Path("temp_files")
 STATIC_DIR = Path("static")
 TEMP_DIR.mkdir(exist_ok=True)
 STATIC_DIR.mkdir(exist_ok=True)
+_STATIC = os.fspath(STATIC_DIR)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 app.mount("/pictures", StaticFiles(directory="../pictures"), name="pictures")
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Initialize OpenAI client (async, with a pooled HTTP/2 keep-alive connection pool)
+openai_client = AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+    )
+)
+
+# Azure voices based on language
+TTS_VOICES = {
+    "en-US": "en-US-JennyNeural",  # Child-friendly voice
+    "es-ES": "es-ES-ElviraNeural",
+    "fr-FR": "fr-FR-DeniseNeural",
+    # Add more languages as needed
+}
+TTS_DEFAULT_VOICE = "en-US-JennyNeural"
+
+# Prosody settings for child-friendly narration
+TTS_RATE = "0.9"
+TTS_PITCH = "+10%"
+
+
+def create_speech_config(voice_name: str, output_format: Optional[speechsdk.SpeechSynthesisOutputFormat] = None) -> speechsdk.SpeechConfig:
+    """Create an Azure Speech configuration bound to a single voice"""
+    config = speechsdk.SpeechConfig(
+        subscription=os.getenv("AZURE_SPEECH_KEY"),
+        region=os.getenv("AZURE_SPEECH_REGION")
+    )
+    config.speech_synthesis_voice_name = voice_name
+    if output_format is not None:
+        config.set_speech_synthesis_output_format(output_format)
+    return config
+
+
+# Azure Speech configuration, one per voice so requests never share mutable state
+speech_configs = {
+    voice_name: create_speech_config(voice_name)
+    for voice_name in set(TTS_VOICES.values())
+}
+
+# MP3 output for progressively streamed audio (playable before the download completes)
+TTS_STREAM_FORMAT = speechsdk.SpeechSynthesisOutputFormat.Audio24Khz48KBitRateMonoMp3
+TTS_STREAM_CHUNK_SIZE = 16 * 1024
+stream_speech_configs = {
+    voice_name: create_speech_config(voice_name, TTS_STREAM_FORMAT)
+    for voice_name in set(TTS_VOICES.values())
+}
 
-# Azure Speech configuration
-speech_config = speechsdk.SpeechConfig(
-    subscription=os.getenv("AZURE_SPEECH_KEY"),
-    region=os.getenv("AZURE_SPEECH_REGION")
+# Sentence boundaries used to split streamed narrations
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Potentially unsafe words, compiled once into a single alternation
+UNSAFE_WORDS = (
+    "scary", "frightening", "dangerous", "violent", "hurt", "pain", "death", "die", "kill",
+    # Add more words as needed
 )
+UNSAFE_WORDS_RE = re.compile(r'\b(?:' + '|'.join(UNSAFE_WORDS) + r')\b', re.IGNORECASE)
+
+# Aho-Corasick automaton over the unsafe words: one linear scan regardless of list size
+if AHOCORASICK_AVAILABLE:
+    UNSAFE_WORDS_AUTOMATON = ahocorasick.Automaton()
+    for word in UNSAFE_WORDS:
+        UNSAFE_WORDS_AUTOMATON.add_word(word.lower(), word.lower())
+    UNSAFE_WORDS_AUTOMATON.make_automaton()
+
+# Age-appropriate complexity for single-page narrations
+NARRATION_COMPLEXITY = {
+    3: "very simple words, 1-2 sentences",
+    4: "simple words, 2-3 sentences",
+    5: "easy words, 3-4 sentences",
+    6: "basic vocabulary, 4-5 sentences",
+    7: "elementary vocabulary, 5-6 sentences"
+}
+
+# Age-appropriate complexity for longer multi-page stories
+STORY_COMPLEXITY = {
+    3: "very simple words, 3-4 sentences total",
+    4: "simple words, 4-6 sentences total",
+    5: "easy words, 6-8 sentences total",
+    6: "basic vocabulary, 8-10 sentences total",
+    7: "elementary vocabulary, 10-12 sentences total"
+}
+
+# System prompts are static so every request shares the same prefix and is
+# eligible for OpenAI prompt caching; per-request values go at the end of the
+# user message
+NARRATION_GUIDELINES = """
+You are a friendly children's reading assistant. Look at the picture book page and create a warm, engaging narration for a child of the given age.
+
+Guidelines:
+- Match the vocabulary and length given as complexity
+- Be encouraging and positive
+- Focus on what's happening in the picture
+- Use child-friendly language
+- Make it sound like a caring adult reading to a child
+- Include emotions and descriptive words that help imagination
+- Keep it safe and appropriate
+- Write in the given language
+"""
+
+NARRATION_SYSTEM_PROMPT = NARRATION_GUIDELINES + """
+Respond with a JSON object: {"narration_text": string}
+"""
+
+NARRATION_STREAM_SYSTEM_PROMPT = NARRATION_GUIDELINES + """
+Reply with the narration text only, without JSON, quotes or any other formatting.
+"""
+
+STORY_SYSTEM_PROMPT = """
+You are a friendly children's reading assistant. Look at the given picture book pages and create a warm, engaging story that connects all the images for a child of the given age.
+
+Guidelines:
+- Match the vocabulary and length given as complexity
+- Create a flowing story that connects all images
+- Be encouraging and positive
+- Focus on what's happening across all the pictures
+- Use child-friendly language
+- Make it sound like a caring adult telling a complete story
+- Include emotions and descriptive words that help imagination
+- Keep it safe and appropriate
+- Make the story longer and more detailed since there are multiple images
+- Connect the scenes logically to create one cohesive narrative
+- Write in the given language
+
+Respond with a JSON object: {"narration_text": string}
+"""
+
+NARRATION_FALLBACK = "What a wonderful picture! I can see so many interesting things happening here. Let's look closely together and imagine the story!"
+
+# Longest image side sent to the VLM (GPT-4o downsamples larger images anyway)
+VLM_MAX_IMAGE_SIDE = 1024
+
+
+def image_to_data_url(image_data: bytes) -> str:
+    """Decode an image once, downscale it and re-encode it as a base64 JPEG data URL"""
+    return pil_image_to_data_url(Image.open(io.BytesIO(image_data)))
+
+
+def pil_image_to_data_url(img: Image.Image) -> str:
+    """Downscale an already opened image and re-encode it as a base64 JPEG data URL"""
+    img = img.convert('RGB')
+    img.thumbnail((VLM_MAX_IMAGE_SIDE, VLM_MAX_IMAGE_SIDE), Image.Resampling.LANCZOS)
+    
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=85, optimize=True)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode('ascii')
 
 
 class NarrationService:
@@ -74,153 +232,149 @@ class NarrationService:
     async def analyze_image(image_data: bytes, age: int = 5, language: str = "en") -> Dict[str, Any]:
         """Analyze image and generate child-friendly narration"""
         
-        # Convert image to base64
-        image_base64 = base64.b64encode(image_data).decode('utf-8')
-        
-        # Age-appropriate prompts
-        age_prompts = {
-            3: "very simple words, 1-2 sentences",
-            4: "simple words, 2-3 sentences", 
-            5: "easy words, 3-4 sentences",
-            6: "basic vocabulary, 4-5 sentences",
-            7: "elementary vocabulary, 5-6 sentences"
-        }
+        # Downscale and convert image to a base64 data URL off the event loop
+        image_url = await asyncio.to_thread(image_to_data_url, image_data)
+        return await NarrationService._narrate(image_url, age, language)
+    
+    @staticmethod
+    async def analyze_image_pil(img: Image.Image, age: int = 5, language: str = "en") -> Dict[str, Any]:
+        """Analyze an already decoded image and generate child-friendly narration"""
         
-        complexity = age_prompts.get(age, "simple words, 3-4 sentences")
+        # Downscale and convert image to a base64 data URL off the event loop
+        image_url = await asyncio.to_thread(pil_image_to_data_url, img)
+        return await NarrationService._narrate(image_url, age, language)
+    
+    @staticmethod
+    async def _narrate(image_url: str, age: int, language: str) -> Dict[str, Any]:
+        """Generate a child-friendly narration for an image data URL"""
         
-        prompt = f"""
-        You are a friendly children's reading assistant. Look at this picture book page and create a warm, engaging narration for a {age}-year-old child.
-
-        Guidelines:
-        - Use {complexity}
-        - Be encouraging and positive
-        - Focus on what's happening in the picture
-        - Use child-friendly language
-        - Make it sound like a caring adult reading to a child
-        - Include emotions and descriptive words that help imagination
-        - Keep it safe and appropriate
-
-        Return your response as JSON with this exact structure:
-        {{
-            "narration_text": "Your warm, engaging narration here"
-        }}
-
-        Language: {language}
-        """
+        complexity = NARRATION_COMPLEXITY.get(age, "simple words, 3-4 sentences")
         
         try:
-            response = openai_client.chat.completions.create(
+            response = await openai_client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
+                    {"role": "system", "content": NARRATION_SYSTEM_PROMPT},
                     {
                         "role": "user",
                         "content": [
-                            {"type": "text", "text": prompt},
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": f"data:image/jpeg;base64,{image_base64}"
+                                    "url": image_url
                                 }
-                            }
+                            },
+                            {"type": "text", "text": f"age={age}, language={language}, complexity={complexity}"}
                         ]
                     }
                 ],
                 max_tokens=300,
-                temperature=0.7
+                temperature=0.7,
+                response_format={"type": "json_object"}
             )
             
-            # Parse the JSON response
-            content = response.choices[0].message.content
-            # Extract JSON from the response (in case there's extra text)
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-                return result
-            else:
-                raise ValueError("No JSON found in response")
+            # JSON mode guarantees the content is a single JSON object
+            return orjson.loads(response.choices[0].message.content)
                 
         except Exception as e:
             print(f"Error in image analysis: {e}")
             # Fallback response
             return {
-                "narration_text": "What a wonderful picture! I can see so many interesting things happening here. Let's look closely together and imagine the story!"
+                "narration_text": NARRATION_FALLBACK
             }
     
     @staticmethod
-    async def analyze_multiple_images(image_data_list: list, filenames: list, age: int = 5, language: str = "en") -> Dict[str, Any]:
-        """Analyze multiple images and generate a connected story"""
-        
-        # Convert all images to base64
-        image_content = []
-        for i, image_data in enumerate(image_data_list):
-            image_base64 = base64.b64encode(image_data).decode('utf-8')
-            image_content.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/jpeg;base64,{image_base64}"
-                }
-            })
-        
-        # Age-appropriate prompts for longer stories
-        age_prompts = {
-            3: "very simple words, 3-4 sentences total",
-            4: "simple words, 4-6 sentences total", 
-            5: "easy words, 6-8 sentences total",
-            6: "basic vocabulary, 8-10 sentences total",
-            7: "elementary vocabulary, 10-12 sentences total"
-        }
+    async def stream_analyze_image(image_url: str, age: int = 5, language: str = "en") -> AsyncIterator[str]:
+        """Analyze an image (a data URL from image_to_data_url) and yield the narration sentence by sentence"""
         
-        complexity = age_prompts.get(age, "easy words, 6-8 sentences total")
-        image_count = len(image_data_list)
+        complexity = NARRATION_COMPLEXITY.get(age, "simple words, 3-4 sentences")
         
-        prompt = f"""
-        You are a friendly children's reading assistant. Look at these {image_count} picture book pages and create a warm, engaging story that connects all the images for a {age}-year-old child.
-
-        Guidelines:
-        - Use {complexity}
-        - Create a flowing story that connects all {image_count} images
-        - Be encouraging and positive
-        - Focus on what's happening across all the pictures
-        - Use child-friendly language
-        - Make it sound like a caring adult telling a complete story
-        - Include emotions and descriptive words that help imagination
-        - Keep it safe and appropriate
-        - Make the story longer and more detailed since there are multiple images
-        - Connect the scenes logically to create one cohesive narrative
-
-        Return your response as JSON with this exact structure:
-        {{
-            "narration_text": "Your warm, engaging connected story here (longer due to multiple images)"
-        }}
-
-        Language: {language}
-        """
+        buffer = ""
+        emitted = False
+        try:
+            stream = await openai_client.chat.completions.create(
+                model="gpt-4o",
+                messages=[
+                    {"role": "system", "content": NARRATION_STREAM_SYSTEM_PROMPT},
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "image_url",
+                                "image_url": {
+                                    "url": image_url
+                                }
+                            },
+                            {"type": "text", "text": f"age={age}, language={language}, complexity={complexity}"}
+                        ]
+                    }
+                ],
+                max_tokens=300,
+                temperature=0.7,
+                stream=True
+            )
+            
+            # Closing the stream aborts the request if the consumer stops early
+            async with stream:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    buffer += chunk.choices[0].delta.content or ""
+                    *sentences, buffer = SENTENCE_END_RE.split(buffer)
+                    for sentence in sentences:
+                        sentence = sentence.strip()
+                        if sentence:
+                            emitted = True
+                            yield sentence
+                
+        except Exception as e:
+            print(f"Error in streaming image analysis: {e}")
+            if not emitted and not buffer.strip():
+                # Fallback response
+                buffer = NARRATION_FALLBACK
+        
+        buffer = buffer.strip()
+        if buffer:
+            yield buffer
+    
+    @staticmethod
+    async def analyze_multiple_images(images: list, filenames: list, age: int = 5, language: str = "en") -> Dict[str, Any]:
+        """Analyze multiple already decoded images and generate a connected story"""
+        
+        # Downscale and convert all images to base64 data URLs in parallel worker threads
+        image_urls = await asyncio.gather(
+            *(asyncio.to_thread(pil_image_to_data_url, img) for img in images)
+        )
+        image_content = [
+            {"type": "image_url", "image_url": {"url": image_url}}
+            for image_url in image_urls
+        ]
+        
+        complexity = STORY_COMPLEXITY.get(age, "easy words, 6-8 sentences total")
+        image_count = len(images)
         
         try:
-            # Create message content with text prompt and all images
-            message_content = [{"type": "text", "text": prompt}] + image_content
+            # Images first, then the per-request parameters, so the prefix stays stable
+            message_content = image_content + [
+                {"type": "text", "text": f"image_count={image_count}, age={age}, language={language}, complexity={complexity}"}
+            ]
             
-            response = openai_client.chat.completions.create(
+            response = await openai_client.chat.completions.create(
                 model="gpt-4o",
                 messages=[
+                    {"role": "system", "content": STORY_SYSTEM_PROMPT},
                     {
                         "role": "user",
                         "content": message_content
                     }
                 ],
                 max_tokens=500 + (image_count * 100),  # More tokens for multiple images
-                temperature=0.7
+                temperature=0.7,
+                response_format={"type": "json_object"}
             )
             
-            # Parse the JSON response
-            content = response.choices[0].message.content
-            # Extract JSON from the response (in case there's extra text)
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if json_match:
-                result = json.loads(json_match.group())
-                return result
-            else:
-                raise ValueError("No JSON found in response")
+            # JSON mode guarantees the content is a single JSON object
+            return orjson.loads(response.choices[0].message.content)
                 
         except Exception as e:
             print(f"Error in multiple image analysis: {e}")
@@ -237,15 +391,8 @@ class SafetyFilter:
     def filter_content(text: str, max_words: int = 100) -> str:
         """Apply safety and length filters"""
         
-        # Remove potentially unsafe content
-        unsafe_patterns = [
-            r'\b(scary|frightening|dangerous|violent|hurt|pain|death|die|kill)\b',
-            # Add more patterns as needed
-        ]
-        
-        filtered_text = text
-        for pattern in unsafe_patterns:
-            filtered_text = re.sub(pattern, '', filtered_text, flags=re.IGNORECASE)
+        # Remove potentially unsafe content in a single pass
+        filtered_text = SafetyFilter._remove_unsafe_words(text)
         
         # Length limiting
         words = filtered_text.split()
@@ -253,62 +400,299 @@ class SafetyFilter:
             filtered_text = ' '.join(words[:max_words]) + "..."
         
         return filtered_text.strip()
+    
+    @staticmethod
+    def _remove_unsafe_words(text: str) -> str:
+        """Cut whole-word unsafe matches out of the text"""
+        
+        lowered = text.lower()
+        # Fall back to the regex when lowercasing shifts character offsets
+        if not AHOCORASICK_AVAILABLE or len(lowered) != len(text):
+            return UNSAFE_WORDS_RE.sub('', text)
+        
+        pieces = []
+        last_end = 0
+        for end_index, word in UNSAFE_WORDS_AUTOMATON.iter(lowered):
+            start = end_index - len(word) + 1
+            end = end_index + 1
+            if start < last_end:
+                continue
+            # Same whole-word semantics as the regex's \b anchors
+            if start > 0 and (lowered[start - 1].isalnum() or lowered[start - 1] == '_'):
+                continue
+            if end < len(lowered) and (lowered[end].isalnum() or lowered[end] == '_'):
+                continue
+            pieces.append(text[last_end:start])
+            last_end = end
+        
+        if not pieces:
+            return text
+        pieces.append(text[last_end:])
+        return ''.join(pieces)
 
 
 class TTSService:
     """Text-to-Speech service using Azure Speech Services"""
     
     @staticmethod
-    async def synthesize_speech(text: str, language: str = "en-US") -> str:
-        """Convert text to speech and return file path"""
-        
-        try:
-            # Configure voice based on language
-            voice_map = {
-                "en-US": "en-US-JennyNeural",  # Child-friendly voice
-                "es-ES": "es-ES-ElviraNeural",
-                "fr-FR": "fr-FR-DeniseNeural",
-                # Add more languages as needed
-            }
-            
-            voice_name = voice_map.get(language, "en-US-JennyNeural")
-            
-            # Create SSML for more natural speech
-            ssml = f"""
+    def _build_ssml(text: str, language: str, voice_name: str) -> str:
+        """Create SSML for more natural speech"""
+        return f"""
             <speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{language}">
                 <voice name="{voice_name}">
-                    <prosody rate="0.9" pitch="+10%">
+                    <prosody rate="{TTS_RATE}" pitch="{TTS_PITCH}">
                         {text}
                     </prosody>
                 </voice>
             </speak>
             """
+    
+    # Request pool: pending (ssml, voice_name, future) items served by warm workers
+    POOL_SIZE = int(os.getenv("TTS_POOL_SIZE", "8"))
+    _queue: Optional[asyncio.Queue] = None
+    _workers: List[asyncio.Task] = []
+    # Dedicated threads for the blocking Azure calls, so a busy pool never starves the default executor
+    _executor: Optional[ThreadPoolExecutor] = None
+    
+    @staticmethod
+    def _create_synthesizer(voice_name: str) -> speechsdk.SpeechSynthesizer:
+        """Create a synthesizer for one voice, without an audio output so results stay in memory"""
+        speech_config = speech_configs.get(voice_name) or create_speech_config(voice_name)
+        return speechsdk.SpeechSynthesizer(
+            speech_config=speech_config, 
+            audio_config=None
+        )
+    
+    @staticmethod
+    def _synthesize_with(synthesizer: speechsdk.SpeechSynthesizer, ssml: str) -> bytes:
+        """Run a blocking Azure synthesis and return the WAV bytes"""
+        result = synthesizer.speak_ssml_async(ssml).get()
+        
+        if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
+            raise Exception(f"Speech synthesis failed: {result.reason}")
+        return result.audio_data
+    
+    @staticmethod
+    async def _worker(worker_id: int):
+        """Serve queued synthesis requests with this worker's warm synthesizers"""
+        
+        # Pre-warm one synthesizer per supported voice
+        synthesizers = {}
+        for voice_name in speech_configs:
+            try:
+                synthesizer = TTSService._create_synthesizer(voice_name)
+                speechsdk.Connection.from_speech_synthesizer(synthesizer).open(True)
+                synthesizers[voice_name] = synthesizer
+            except Exception as e:
+                print(f"⚠️ TTS worker {worker_id} could not pre-warm {voice_name}: {e}")
+        
+        while True:
+            ssml, voice_name, future = await TTSService._queue.get()
+            try:
+                if future.cancelled():
+                    continue
+                
+                synthesizer = synthesizers.get(voice_name)
+                if synthesizer is None:
+                    synthesizer = synthesizers[voice_name] = TTSService._create_synthesizer(voice_name)
+                
+                audio_data = await asyncio.get_running_loop().run_in_executor(
+                    TTSService._executor, TTSService._synthesize_with, synthesizer, ssml
+                )
+                if not future.done():
+                    future.set_result(audio_data)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                TTSService._queue.task_done()
+    
+    @staticmethod
+    def start_pool():
+        """Start the synthesis worker pool (called on app startup)"""
+        if TTSService._queue is not None:
+            return
+        
+        TTSService._queue = asyncio.Queue()
+        TTSService._executor = ThreadPoolExecutor(max_workers=TTSService.POOL_SIZE, thread_name_prefix="tts")
+        TTSService._workers = [
+            asyncio.create_task(TTSService._worker(i))
+            for i in range(TTSService.POOL_SIZE)
+        ]
+    
+    @staticmethod
+    async def stop_pool():
+        """Stop the synthesis worker pool (called on app shutdown)"""
+        for worker in TTSService._workers:
+            worker.cancel()
+        await asyncio.gather(*TTSService._workers, return_exceptions=True)
+        TTSService._workers = []
+        TTSService._queue = None
+        if TTSService._executor is not None:
+            TTSService._executor.shutdown(wait=False, cancel_futures=True)
+            TTSService._executor = None
+    
+    @staticmethod
+    async def _synthesize(ssml: str, voice_name: str) -> bytes:
+        """Queue a synthesis request on the worker pool and wait for its WAV bytes"""
+        if TTSService._queue is None:
+            # Pool not running (e.g. used outside the app) - synthesize directly
+            synthesizer = TTSService._create_synthesizer(voice_name)
+            return await asyncio.to_thread(TTSService._synthesize_with, synthesizer, ssml)
+        
+        future = asyncio.get_running_loop().create_future()
+        await TTSService._queue.put((ssml, voice_name, future))
+        return await future
+    
+    @staticmethod
+    async def synthesize_speech(text: str, language: str = "en-US") -> Optional[str]:
+        """Convert text to speech and return file path"""
+        
+        try:
+            voice_name = TTS_VOICES.get(language, TTS_DEFAULT_VOICE)
             
-            # Generate unique filename
-            audio_filename = f"narration_{uuid.uuid4().hex}.wav"
-            audio_path = STATIC_DIR / audio_filename
-            
-            # Configure audio output
-            audio_config = speechsdk.audio.AudioOutputConfig(filename=str(audio_path))
-            speech_config.speech_synthesis_voice_name = voice_name
-            
-            # Create synthesizer and synthesize
-            synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=speech_config, 
-                audio_config=audio_config
-            )
+            # Reuse previously synthesized audio for identical requests
+            audio_cache = get_audio_cache()
+            key = cache_key(text, voice_name, language, TTS_RATE, TTS_PITCH)
+            cached_url = audio_cache.lookup(key, ".wav")
+            if cached_url:
+                return cached_url
             
-            result = synthesizer.speak_ssml_async(ssml).get()
+            ssml = TTSService._build_ssml(text, language, voice_name)
+            audio_data = await TTSService._synthesize(ssml, voice_name)
             
-            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-                return f"/static/{audio_filename}"
-            else:
-                raise Exception(f"Speech synthesis failed: {result.reason}")
+            # Write the audio once, straight into the cache
+            return await audio_cache.store(key, ".wav", audio_data)
                 
         except Exception as e:
             print(f"TTS Error: {e}")
             # Return None if TTS fails - client will use text fallback
             return None
+    
+    @staticmethod
+    async def synthesize_sentence(text: str, language: str = "en-US") -> Optional[bytes]:
+        """Synthesize one sentence on the worker pool (or reuse its cached audio) and return its WAV bytes"""
+        
+        try:
+            voice_name = TTS_VOICES.get(language, TTS_DEFAULT_VOICE)
+            
+            # Sentences recur across narrations, so cache each one on its own
+            audio_cache = get_audio_cache()
+            key = cache_key(text, voice_name, language, TTS_RATE, TTS_PITCH)
+            cached_path = audio_cache.lookup_path(key, ".wav")
+            if cached_path:
+                try:
+                    async with aiofiles.open(cached_path, "rb") as f:
+                        return await f.read()
+                except OSError:
+                    pass  # Evicted since the lookup - synthesize it again
+            
+            ssml = TTSService._build_ssml(text, language, voice_name)
+            audio_data = await TTSService._synthesize(ssml, voice_name)
+            await audio_cache.store(key, ".wav", audio_data)
+            return audio_data
+        except Exception as e:
+            print(f"TTS Error: {e}")
+            return None
+    
+    @staticmethod
+    async def store_narration(text: str, language: str, audio_parts: List[Optional[bytes]]) -> Optional[str]:
+        """Stitch per-sentence WAV audio into one file in the cache and return its URL"""
+        
+        if not audio_parts or any(part is None for part in audio_parts):
+            return None
+        
+        try:
+            voice_name = TTS_VOICES.get(language, TTS_DEFAULT_VOICE)
+            audio_cache = get_audio_cache()
+            key = cache_key(text, voice_name, language, TTS_RATE, TTS_PITCH)
+            
+            output = io.BytesIO()
+            with wave.open(output, "wb") as stitched:
+                for i, part in enumerate(audio_parts):
+                    with wave.open(io.BytesIO(part), "rb") as sentence_audio:
+                        if i == 0:
+                            stitched.setparams(sentence_audio.getparams())
+                        stitched.writeframes(sentence_audio.readframes(sentence_audio.getnframes()))
+            
+            return await audio_cache.store(key, ".wav", output.getvalue())
+        
+        except Exception as e:
+            print(f"TTS Error: {e}")
+            return None
+    
+    @staticmethod
+    async def stream_speech(text: str, language: str = "en-US") -> AsyncIterator[bytes]:
+        """Start synthesis and return an iterator of MP3 chunks; raises if Azure rejects the request"""
+        
+        voice_name = TTS_VOICES.get(language, TTS_DEFAULT_VOICE)
+        audio_cache = get_audio_cache()
+        key = cache_key(text, voice_name, language, TTS_RATE, TTS_PITCH)
+        
+        # Cached audio is streamed straight from disk; opened here so an eviction
+        # is noticed before any response headers go out
+        cached_path = audio_cache.lookup_path(key, ".mp3")
+        if cached_path:
+            try:
+                return TTSService._stream_file(open(cached_path, "rb"))
+            except OSError:
+                pass  # Evicted since the lookup - synthesize it again
+        
+        ssml = TTSService._build_ssml(text, language, voice_name)
+        synthesizer = speechsdk.SpeechSynthesizer(
+            speech_config=stream_speech_configs.get(voice_name) or create_speech_config(voice_name, TTS_STREAM_FORMAT),
+            audio_config=None
+        )
+        
+        # Returns as soon as the first audio arrives, not when synthesis completes;
+        # checked here, before any response headers go out
+        result = await asyncio.to_thread(lambda: synthesizer.start_speaking_ssml_async(ssml).get())
+        if result.reason != speechsdk.ResultReason.SynthesizingAudioStarted:
+            raise Exception(f"Speech synthesis failed: {result.reason}")
+        
+        return TTSService._stream_result(synthesizer, result, key)
+    
+    @staticmethod
+    async def _stream_file(f) -> AsyncIterator[bytes]:
+        """Yield an open cached audio file in chunks, closing it at the end"""
+        with f:
+            while chunk := await asyncio.to_thread(f.read, TTS_STREAM_CHUNK_SIZE):
+                yield chunk
+    
+    @staticmethod
+    async def _stream_result(
+        synthesizer: speechsdk.SpeechSynthesizer, result: speechsdk.SpeechSynthesisResult, key: str
+    ) -> AsyncIterator[bytes]:
+        """Yield MP3 audio chunks as Azure produces them, caching the complete file"""
+        # 'synthesizer' is held until the stream is drained so it isn't finalized mid-synthesis
+        stream = speechsdk.AudioDataStream(result)
+        
+        chunks = []
+        buffer = bytes(TTS_STREAM_CHUNK_SIZE)
+        while True:
+            filled_size = await asyncio.to_thread(stream.read_data, buffer)
+            if filled_size == 0:
+                break
+            chunk = buffer[:filled_size]
+            chunks.append(chunk)
+            yield chunk
+        
+        if stream.status == speechsdk.StreamStatus.AllData:
+            await get_audio_cache().store(key, ".mp3", b"".join(chunks))
+        else:
+            print(f"TTS Error: audio stream ended with status {stream.status}")
+
+
+@app.on_event("startup")
+async def start_tts_pool():
+    """Start the TTS worker pool"""
+    TTSService.start_pool()
+
+
+@app.on_event("shutdown")
+async def stop_tts_pool():
+    """Stop the TTS worker pool"""
+    await TTSService.stop_pool()
 
 
 @app.get("/")
@@ -317,6 +701,80 @@ async def root():
     return {"message": "GlimmerRead API is running!", "version": "1.0.0"}
 
 
+async def _read_image_bytes(image: UploadFile, age: int) -> bytes:
+    """Validate an uploaded picture and request age; returns the raw image bytes"""
+    
+    # Validate file type
+    if not image.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="File must be an image")
+    
+    # Validate age range
+    if not 3 <= age <= 10:
+        raise HTTPException(status_code=400, detail="Age must be between 3 and 10")
+    
+    # Read and validate image
+    image_data = await image.read()
+    if len(image_data) > 10 * 1024 * 1024:  # 10MB limit
+        raise HTTPException(status_code=400, detail="Image too large (max 10MB)")
+    
+    return image_data
+
+
+async def _decode_image_upload(image_data: bytes) -> str:
+    """Decode an uploaded picture; returns the image as a VLM data URL"""
+    
+    # Validate image format while decoding, downscaling and encoding it for the VLM
+    try:
+        return await asyncio.to_thread(image_to_data_url, image_data)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid image format")
+
+
+async def _stream_safe_sentences(image_url: str, age: int, language: str) -> AsyncIterator[str]:
+    """Stream narration sentences through the safety filter within the age-based word limit"""
+    max_words = 50 + (age * 10)  # Scale with age
+    word_count = 0
+    
+    # aclosing: stop the VLM stream as soon as the budget is spent instead of paying for the rest
+    async with contextlib.aclosing(NarrationService.stream_analyze_image(image_url, age, language)) as sentences:
+        async for sentence in sentences:
+            if word_count >= max_words:
+                break
+            
+            safe_sentence = SafetyFilter.filter_content(sentence, max_words=max_words - word_count)
+            if not safe_sentence:
+                continue
+            
+            word_count += len(safe_sentence.split())
+            yield safe_sentence
+
+
+# In-flight /generate pipelines keyed by (image digest, age, language), so
+# concurrent identical requests share one VLM call and one synthesis
+_inflight: Dict[Tuple[str, int, str], "asyncio.Task[Tuple[str, str]]"] = {}
+
+
+async def _narrate_upload(image_data: bytes, age: int, language: str) -> Tuple[str, str]:
+    """Run the narration pipeline for one picture; returns (narration text, audio URL)"""
+    image_url = await _decode_image_upload(image_data)
+    
+    # Stream the narration from the VLM, filter each sentence and start its
+    # speech synthesis while the rest of the narration is generated
+    sentences = []
+    tts_tasks = []
+    
+    async for safe_sentence in _stream_safe_sentences(image_url, age, language):
+        sentences.append(safe_sentence)
+        tts_tasks.append(asyncio.create_task(
+            TTSService.synthesize_sentence(safe_sentence, language)
+        ))
+    
+    safe_narration = " ".join(sentences)
+    audio_parts = await asyncio.gather(*tts_tasks)
+    audio_url = await TTSService.store_narration(safe_narration, language, audio_parts)
+    return safe_narration, audio_url
+
+
 @app.post("/generate")
 async def generate_narration(
     image: UploadFile = File(...),
@@ -332,39 +790,18 @@ async def generate_narration(
     """
     
     try:
-        # Validate file type
-        if not image.content_type.startswith('image/'):
-            raise HTTPException(status_code=400, detail="File must be an image")
+        image_data = await _read_image_bytes(image, age)
         
-        # Validate age range
-        if not 3 <= age <= 10:
-            raise HTTPException(status_code=400, detail="Age must be between 3 and 10")
-        
-        # Read and validate image
-        image_data = await image.read()
-        if len(image_data) > 10 * 1024 * 1024:  # 10MB limit
-            raise HTTPException(status_code=400, detail="Image too large (max 10MB)")
-        
-        # Validate image format
-        try:
-            img = Image.open(io.BytesIO(image_data))
-            img.verify()
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid image format")
-        
-        # Step 1: Analyze image with VLM
-        narration_data = await NarrationService.analyze_image(
-            image_data, age, language
-        )
-        
-        # Step 2: Apply safety filters
-        safe_narration = SafetyFilter.filter_content(
-            narration_data["narration_text"], 
-            max_words=50 + (age * 10)  # Scale with age
-        )
+        # Steps 1-3: Narrate and synthesize, joining an identical request already in flight
+        key = (hashlib.blake2b(image_data, digest_size=16).hexdigest(), age, language)
+        task = _inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(_narrate_upload(image_data, age, language))
+            _inflight[key] = task
+            task.add_done_callback(lambda _: _inflight.pop(key, None))
         
-        # Step 3: Generate speech
-        audio_url = await TTSService.synthesize_speech(safe_narration, language)
+        # Shielded so one disconnecting client does not cancel the others' pipeline
+        safe_narration, audio_url = await asyncio.shield(task)
         
         # Step 4: Return response
         response = {
@@ -384,6 +821,69 @@ async def generate_narration(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@app.post("/generate-stream")
+async def generate_narration_stream(
+    image: UploadFile = File(...),
+    age: int = Form(5),
+    language: str = Form("en-US")
+):
+    """
+    Generate voice narration from a picture book image and stream the audio (MP3)
+    as it is synthesized; the narration text is returned URL-encoded in the
+    X-Narration-Text header
+    
+    - **image**: Picture book page image (jpg, png)
+    - **age**: Child's age (3-10)
+    - **language**: Language code (en-US, es-ES, fr-FR)
+    """
+    
+    try:
+        image_url = await _decode_image_upload(await _read_image_bytes(image, age))
+        
+        sentences = [
+            safe_sentence
+            async for safe_sentence in _stream_safe_sentences(image_url, age, language)
+        ]
+        safe_narration = " ".join(sentences)
+        
+        try:
+            audio_stream = await TTSService.stream_speech(safe_narration, language)
+        except Exception as e:
+            print(f"TTS Error: {e}")
+            raise HTTPException(status_code=500, detail="Speech synthesis failed")
+        
+        return StreamingResponse(
+            audio_stream,
+            media_type="audio/mpeg",
+            headers={"X-Narration-Text": quote(safe_narration)}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _load_and_verify(filename: str) -> Optional[Tuple[str, Image.Image]]:
+    """Read and decode a picture from disk; returns None if it is missing or invalid"""
+    image_path = Path("../pictures") / filename
+    
+    if not image_path.exists():
+        print(f"Warning: Image file '{filename}' not found, skipping")
+        return None
+    
+    try:
+        # Decoding fully validates the image format, and the decoded image is reused for analysis
+        img = Image.open(image_path)
+        img.load()
+        
+        return filename, img
+    except Exception as e:
+        print(f"Warning: Invalid image format for '{filename}': {e}, skipping")
+        return None
+
+
 @app.post("/generate-from-filename")
 async def generate_narration_from_filename(
     image_filenames: str = Form(...),  # Now accepts comma-separated filenames
@@ -412,48 +912,31 @@ async def generate_narration_from_filename(
         if len(filenames) > 4:
             filenames = filenames[:4]
         
-        image_data_list = []
-        valid_filenames = []
-        
-        # Read and validate all images
-        for filename in filenames:
-            image_path = Path("../pictures") / filename
-            
-            if not image_path.exists():
-                print(f"Warning: Image file '{filename}' not found, skipping")
-                continue
-            
-            try:
-                with open(image_path, 'rb') as f:
-                    image_data = f.read()
-                
-                # Validate image format
-                img = Image.open(io.BytesIO(image_data))
-                img.verify()
-                
-                image_data_list.append(image_data)
-                valid_filenames.append(filename)
-            except Exception as e:
-                print(f"Warning: Invalid image format for '{filename}': {e}, skipping")
-                continue
+        # Read and validate all images concurrently, off the event loop
+        results = await asyncio.gather(
+            *(asyncio.to_thread(_load_and_verify, filename) for filename in filenames)
+        )
+        loaded = [result for result in results if result is not None]
+        valid_filenames = [filename for filename, _ in loaded]
+        images = [img for _, img in loaded]
         
-        if not image_data_list:
+        if not images:
             raise HTTPException(status_code=400, detail="No valid images found")
         
         # Step 1: Analyze images with VLM
-        if len(image_data_list) == 1:
+        if len(images) == 1:
             # Single image analysis
-            narration_data = await NarrationService.analyze_image(
-                image_data_list[0], age, language
+            narration_data = await NarrationService.analyze_image_pil(
+                images[0], age, language
             )
         else:
             # Multiple images analysis
             narration_data = await NarrationService.analyze_multiple_images(
-                image_data_list, valid_filenames, age, language
+                images, valid_filenames, age, language
             )
         
         # Step 2: Apply safety filters with longer content for multiple images
-        word_limit = 50 + (age * 10) + (len(image_data_list) * 30)  # More words for more images
+        word_limit = 50 + (age * 10) + (len(images) * 30)  # More words for more images
         safe_narration = SafetyFilter.filter_content(
             narration_data["narration_text"], 
             max_words=word_limit
@@ -485,8 +968,8 @@ async def generate_narration_from_filename(
 @app.get("/audio/{filename}")
 async def get_audio(filename: str):
     """Serve audio files"""
-    file_path = STATIC_DIR / filename
-    if not file_path.exists():
+    file_path = os.path.join(_STATIC, filename)
+    if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="Audio file not found")
     
     return FileResponse(
@@ -628,15 +1111,17 @@ async def get_current_gaze_data(count: int = 1):
                 "gaze_data": []
             }
         
-        gaze_data = tobii_service.get_latest_gaze_data(count)
+        # Splice in the pre-encoded samples; returned as a response directly so
+        # FastAPI's jsonable_encoder doesn't walk the Fragment
+        gaze_data = orjson.Fragment(tobii_service.get_latest_gaze_json(count))
         current_position = tobii_service.get_current_gaze_position()
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "gaze_data": gaze_data,
             "current_position": current_position,
             "timestamp": time.time()
-        }
+        })
     except Exception as e:
         return {
             "success": False,
@@ -663,18 +1148,15 @@ async def disconnect_eye_tracker():
 
 @app.delete("/cleanup")
 async def cleanup_temp_files():
-    """Clean up old temporary files (call periodically)"""
+    """Evict least recently used audio files beyond the cache size cap"""
     try:
-        current_time = time.time()
-        deleted_count = 0
+        audio_cache = get_audio_cache()
+        deleted_count = audio_cache.enforce_cap()
         
-        # Delete files older than 1 hour
-        for file_path in STATIC_DIR.glob("*.wav"):
-            if current_time - file_path.stat().st_mtime > 3600:
-                file_path.unlink()
-                deleted_count += 1
-        
-        return {"message": f"Cleaned up {deleted_count} files"}
+        return {
+            "message": f"Cleaned up {deleted_count} files",
+            "cache": audio_cache.get_stats()
+        }
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Cleanup failed: {e}")
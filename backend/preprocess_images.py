@@ -7,22 +7,36 @@ and save them to a structured format for quick loading during runtime.
 
 import os
 import sys
-import json
+import orjson
+import argparse
+import contextlib
+import queue
+import threading
 import time
 import numpy as np
 import cv2
+import subprocess
 import torch
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
-import pickle
-import base64
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add the current directory to Python path to import SAM modules
 sys.path.append(os.path.dirname(__file__))
 
+try:
+    import msgspec
+    from pycocotools import mask as maskUtils
+except ImportError as e:
+    print(f"❌ Failed to import pre-processing dependencies: {e}")
+    print("Please install the pre-processing dependencies: pip install -r requirements-preprocess.txt")
+    sys.exit(1)
+
 # Import SAM components
 try:
     from segment_anything import sam_model_registry, SamAutomaticMaskGenerator
+    from segment_anything.utils.amg import generate_crop_boxes
     SAM_AVAILABLE = True
     print("✅ SAM modules imported successfully")
 except ImportError as e:
@@ -31,22 +45,133 @@ except ImportError as e:
     SAM_AVAILABLE = False
     sys.exit(1)
 
+# Optional: segment-anything-fast (fused SDPA kernels + torch.compile) for the CUDA path
+os.environ.setdefault("TORCH_COMPILE_MODE", "reduce-overhead")
+try:
+    from segment_anything_fast import sam_model_fast_registry
+    from segment_anything_fast import SamAutomaticMaskGenerator as FastSamAutomaticMaskGenerator
+    SAM_FAST_AVAILABLE = True
+    print("✅ segment-anything-fast available")
+except ImportError:
+    SAM_FAST_AVAILABLE = False
+
+# Optional: TensorRT engine for the SAM image encoder (opt in with SAM_TENSORRT=1)
+try:
+    import tensorrt as trt
+    TENSORRT_AVAILABLE = True
+except ImportError:
+    TENSORRT_AVAILABLE = False
+
+SAM_ENCODER_INPUT_SIZE = 1024
+
+# OpenCV >= 4.7 can decode straight to RGB, saving a full-size BGR->RGB copy
+IMREAD_COLOR_RGB = getattr(cv2, "IMREAD_COLOR_RGB", None)
+cv2.setNumThreads(os.cpu_count() or 1)
+
+
+class ObjectRecord(msgspec.Struct):
+    """One segmented object as stored in a *_segmentation.msgpack file"""
+    object_id: str
+    bbox: List[int]  # [x1, y1, x2, y2] in pixels, uint16 range
+    area: int
+    center: List[int]
+    iou_q8: int  # predicted IoU scaled to 0-255
+    stab_q8: int  # stability score scaled to 0-255
+    mask_shape: Tuple[int, int]
+    mask: bytes  # COCO RLE counts of the mask; its size is mask_shape
+
+
+def quantize_q8(values: np.ndarray) -> np.ndarray:
+    """Scale scores in [0, 1] to uint8"""
+    return np.rint(np.clip(values, 0.0, 1.0) * 255).astype(np.uint8)
+
+
+def dequantize(record: ObjectRecord) -> Dict[str, Any]:
+    """Recover float scores and bbox from a stored record"""
+    return {
+        'bbox': [float(v) for v in record.bbox],
+        'predicted_iou': record.iou_q8 / 255,
+        'stability_score': record.stab_q8 / 255
+    }
+
+
+def decode_mask(counts: bytes, shape: Tuple[int, int]) -> np.ndarray:
+    """Decode a COCO RLE mask back to a boolean array"""
+    return maskUtils.decode({'size': list(shape), 'counts': counts}).astype(bool)
+
+
+def _write_segmentation(output_file: Path, records: List[ObjectRecord]):
+    """Encode and write one image's object records"""
+    output_file.write_bytes(msgspec.msgpack.encode(records))
+
+
+def _write_summary(summary_file: Path, summary_data: Dict):
+    """Write the human-readable JSON summary for one image"""
+    summary_file.write_bytes(orjson.dumps(
+        summary_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+    ))
+
+
+class TensorRTImageEncoder:
+    """Runs a static-shape TensorRT engine in place of the SAM image encoder's forward"""
+    
+    def __init__(self, engine_path: str):
+        logger = trt.Logger(trt.Logger.WARNING)
+        with open(engine_path, 'rb') as f:
+            self.engine = trt.Runtime(logger).deserialize_cuda_engine(f.read())
+        self.context = self.engine.create_execution_context()
+        
+        names = [self.engine.get_tensor_name(i) for i in range(self.engine.num_io_tensors)]
+        self.input_name = next(n for n in names if self.engine.get_tensor_mode(n) == trt.TensorIOMode.INPUT)
+        self.output_name = next(n for n in names if self.engine.get_tensor_mode(n) == trt.TensorIOMode.OUTPUT)
+        self.input_shape = tuple(self.engine.get_tensor_shape(self.input_name))
+        self.output_shape = tuple(self.engine.get_tensor_shape(self.output_name))
+    
+    def __call__(self, x: torch.Tensor) -> torch.Tensor:
+        # The engine has a static batch of one; run batched inputs item by item
+        if x.shape[0] > 1:
+            return torch.cat([self(item[None]) for item in x])
+        if tuple(x.shape) != self.input_shape:
+            raise ValueError(f"TensorRT encoder expects {self.input_shape}, got {tuple(x.shape)}")
+        
+        # Torch tensors double as the engine's device buffers; no extra host copies
+        x = x.to(dtype=torch.float32).contiguous()
+        out = torch.empty(self.output_shape, dtype=torch.float32, device=x.device)
+        self.context.set_tensor_address(self.input_name, x.data_ptr())
+        self.context.set_tensor_address(self.output_name, out.data_ptr())
+        self.context.execute_async_v3(torch.cuda.current_stream().cuda_stream)
+        return out
+
 
 class ImagePreprocessor:
     """Pre-processes images with SAM segmentation and saves results"""
     
-    def __init__(self, sam_checkpoint_path: str = "./model/sam_vit_h_4b8939.pth"):
-        """Initialize the preprocessor with SAM model"""
+    def __init__(self, sam_checkpoint_path: str = "./model/sam_vit_h_4b8939.pth", batch_size: int = 4):
+        """Initialize the preprocessor; SAM itself is loaded on first use"""
         self.sam_checkpoint = sam_checkpoint_path
+        self.batch_size = max(1, batch_size)
+        # Crops per encoder call; halved on GPU OOM without changing how many images are grouped
+        self._encode_batch = self.batch_size
         self.predictor = None
         self.mask_generator = None
         self.sam_device = None
+        self._autocast_dtype = None
+        # Precomputed encoder features for the image being processed, in set_image call order
+        self._pending_features = deque()
+        # Pinned host staging buffer for image uploads, reused across images
+        self._staging: Optional[torch.Tensor] = None
+        self._staging_done = None
+        # Segmentation and summary files are written concurrently
+        self._writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="writer")
         
         # Create output directories
         self.output_dir = Path("./segmented_objects")
         self.output_dir.mkdir(exist_ok=True)
-        
-        self._initialize_sam()
+    
+    def _ensure_sam(self):
+        """Load SAM if it has not been loaded yet"""
+        if self.mask_generator is None:
+            self._initialize_sam()
     
     def _initialize_sam(self):
         """Initialize SAM model and mask generator"""
@@ -72,13 +197,27 @@ class ImagePreprocessor:
                 print(f"   GPU: {gpu_name}")
                 print(f"   GPU Memory: {gpu_memory:.1f} GB")
             
-            # Load model
-            print("   Loading SAM model...")
-            sam = sam_model_registry[model_type](checkpoint=self.sam_checkpoint)
+            # Load model; the fast variant's compiled kernels need CUDA
+            use_fast = SAM_FAST_AVAILABLE and cuda_available
+            print(f"   Loading SAM model{' (segment-anything-fast)' if use_fast else ''}...")
+            if use_fast:
+                sam = sam_model_fast_registry[model_type](checkpoint=self.sam_checkpoint)
+                generator_class = FastSamAutomaticMaskGenerator
+            else:
+                sam = sam_model_registry[model_type](checkpoint=self.sam_checkpoint)
+                generator_class = SamAutomaticMaskGenerator
             sam.to(device=device)
+            sam.eval()
+            
+            # Half precision matmuls on tensor cores for the ViT-H encoder
+            self._autocast_dtype = torch.float16 if cuda_available else None
+            
+            # Inputs are resized to a fixed 1024x1024 by SAM, so let cuDNN pick the fastest kernels once
+            if cuda_available:
+                torch.backends.cudnn.benchmark = True
             
             # Initialize automatic mask generator with optimized settings
-            self.mask_generator = SamAutomaticMaskGenerator(
+            self.mask_generator = generator_class(
                 sam,
                 points_per_side=32,  # Dense grid for comprehensive coverage
                 pred_iou_thresh=0.86,  # Quality threshold
@@ -90,6 +229,21 @@ class ImagePreprocessor:
             
             self.sam_device = device
             
+            # Let the generator's per-crop set_image consume batched embeddings
+            predictor = self.mask_generator.predictor
+            self._predictor_set_image = predictor.set_image
+            predictor.set_image = self._set_image
+            
+            trt_enabled = False
+            if not use_fast and cuda_available and os.getenv("SAM_TENSORRT") == "1":
+                trt_enabled = self._enable_trt_encoder(sam, model_type)
+            
+            if use_fast:
+                # Pay the torch.compile autotuning cost once, before the first real image
+                self._warmup()
+            elif cuda_available:
+                self._compile_sam(sam, compile_encoder=not trt_enabled)
+            
             print(f"✅ SAM model loaded successfully on {device.upper()}")
             print(f"✅ Auto-segmentation generator initialized")
             
@@ -99,54 +253,234 @@ class ImagePreprocessor:
             traceback.print_exc()
             raise
     
-    def _process_masks(self, masks: List[Dict], image_filename: str) -> Dict[str, Any]:
-        """Process masks and convert to storable format"""
-        processed_objects = {}
+    def _build_trt_engine(self, sam, model_type: str) -> str:
+        """Export the image encoder to ONNX and build a static-shape FP16 TensorRT engine once"""
+        model_dir = os.path.dirname(self.sam_checkpoint)
+        engine_path = os.path.join(model_dir, f"sam_{model_type}_encoder_fp16.engine")
+        if os.path.exists(engine_path):
+            return engine_path
         
-        print(f"   Processing {len(masks)} masks...")
+        onnx_path = os.path.join(model_dir, f"sam_{model_type}_encoder.onnx")
+        if not os.path.exists(onnx_path):
+            print(f"   Exporting image encoder to ONNX: {onnx_path}")
+            # The ONNX tracer rejects inference tensors, so plain no_grad (even if a caller is in inference mode)
+            with torch.inference_mode(False), torch.no_grad():
+                dummy = torch.randn(1, 3, SAM_ENCODER_INPUT_SIZE, SAM_ENCODER_INPUT_SIZE, device="cuda")
+                torch.onnx.export(
+                    sam.image_encoder, dummy, onnx_path,
+                    input_names=["image"], output_names=["embeddings"], opset_version=17
+                )
         
-        for i, mask_data in enumerate(masks):
-            # Create unique object ID
-            object_id = f"{image_filename}_obj_{i:04d}"
+        print(f"   Building TensorRT engine (one-off, several minutes): {engine_path}")
+        subprocess.run(
+            ["trtexec", f"--onnx={onnx_path}", f"--saveEngine={engine_path}", "--fp16"],
+            check=True
+        )
+        return engine_path
+    
+    def _enable_trt_encoder(self, sam, model_type: str) -> bool:
+        """Route the image encoder through TensorRT; the mask decoder stays in PyTorch"""
+        if not TENSORRT_AVAILABLE:
+            print("   ⚠️  SAM_TENSORRT=1 but tensorrt is not installed, using PyTorch encoder")
+            return False
+        
+        try:
+            engine = TensorRTImageEncoder(self._build_trt_engine(sam, model_type))
+            sam.image_encoder.forward = engine
+            print("   TensorRT image encoder enabled")
+            return True
+        except Exception as e:
+            print(f"   ⚠️  TensorRT encoder unavailable, using PyTorch encoder: {type(e).__name__}: {e}")
+            return False
+    
+    def _compile_sam(self, sam, compile_encoder: bool = True):
+        """torch.compile the encoder and the per-prompt mask decoder, reverting if compilation fails"""
+        modules = ["mask_decoder"] + (["image_encoder"] if compile_encoder else [])
+        originals = {name: getattr(sam, name) for name in modules}
+        
+        try:
+            for name in modules:
+                # The decoder runs as many small launches per image; CUDA graphs remove their overhead
+                setattr(sam, name, torch.compile(originals[name], mode="reduce-overhead", fullgraph=False))
+            self._warmup()
+        except Exception as e:
+            print(f"   ⚠️  torch.compile failed, running SAM eagerly: {e}")
+            for name, module in originals.items():
+                setattr(sam, name, module)
+    
+    def _warmup(self):
+        """Run one dummy image so compilation and autotuning happen before real work"""
+        print("   Warming up compiled kernels...")
+        warmup_start = time.time()
+        self._generate(np.zeros((SAM_ENCODER_INPUT_SIZE, SAM_ENCODER_INPUT_SIZE, 3), dtype=np.uint8))
+        print(f"   Warm-up completed in {time.time() - warmup_start:.2f} seconds")
+    
+    @contextlib.contextmanager
+    def _inference(self):
+        """No autograd, and autocast on CUDA"""
+        with torch.inference_mode(), torch.autocast(
+            device_type=self.sam_device,
+            dtype=self._autocast_dtype or torch.float32,
+            enabled=self._autocast_dtype is not None
+        ):
+            yield
+    
+    def _generate(self, image_rgb: np.ndarray) -> List[Dict]:
+        """Run the mask generator"""
+        with self._inference():
+            return self.mask_generator.generate(image_rgb)
+    
+    def _set_image(self, image: np.ndarray, image_format: str = "RGB"):
+        """SamPredictor.set_image shim that uses a precomputed embedding when one is queued"""
+        if not self._pending_features:
+            return self._predictor_set_image(image, image_format)
+        
+        predictor = self.mask_generator.predictor
+        input_size, features = self._pending_features.popleft()
+        predictor.reset_image()
+        predictor.original_size = image.shape[:2]
+        predictor.input_size = input_size
+        predictor.features = features
+        predictor.is_image_set = True
+    
+    def _precompute_embeddings(self, images: List[np.ndarray]) -> List[deque]:
+        """Encode every crop the generator will request for these images in batched forward passes"""
+        generator = self.mask_generator
+        predictor = generator.predictor
+        sam = predictor.model
+        
+        # Same crops, in the same order, as SamAutomaticMaskGenerator._generate_masks
+        input_sizes = []
+        inputs = []
+        crops_per_image = []
+        with self._inference():
+            for image in images:
+                crop_boxes, _ = generate_crop_boxes(
+                    image.shape[:2], generator.crop_n_layers, generator.crop_overlap_ratio
+                )
+                crops_per_image.append(len(crop_boxes))
+                
+                if predictor.device.type == "cuda":
+                    # Upload the full image once; crop, resize and normalize on the GPU
+                    image_torch = self._upload(image, predictor.device).permute(2, 0, 1)[None, :, :, :]
+                    for x0, y0, x1, y1 in crop_boxes:
+                        crop_torch = image_torch[..., y0:y1, x0:x1].float()
+                        crop_torch = predictor.transform.apply_image_torch(crop_torch)
+                        input_sizes.append(tuple(crop_torch.shape[-2:]))
+                        inputs.append(sam.preprocess(crop_torch))
+                    continue
+                
+                for x0, y0, x1, y1 in crop_boxes:
+                    crop = predictor.transform.apply_image(image[y0:y1, x0:x1, :])
+                    crop_torch = torch.as_tensor(crop, device=predictor.device)
+                    crop_torch = crop_torch.permute(2, 0, 1).contiguous()[None, :, :, :]
+                    input_sizes.append(tuple(crop_torch.shape[-2:]))
+                    inputs.append(sam.preprocess(crop_torch))
             
-            # Extract mask and metadata
-            mask = mask_data['segmentation']  # Boolean mask
-            bbox = mask_data['bbox']  # [x, y, width, height]
-            area = mask_data['area']
-            predicted_iou = mask_data['predicted_iou']
-            stability_score = mask_data['stability_score']
-            
-            # Calculate center point
-            center_x = bbox[0] + bbox[2] / 2
-            center_y = bbox[1] + bbox[3] / 2
-            
-            # Convert bbox to [x1, y1, x2, y2] format
-            bbox_xyxy = [bbox[0], bbox[1], bbox[0] + bbox[2], bbox[1] + bbox[3]]
-            
-            # Store object data
-            processed_objects[object_id] = {
-                'object_id': object_id,
-                'bbox': bbox_xyxy,
-                'area': int(area),
-                'center': [int(center_x), int(center_y)],
-                'predicted_iou': float(predicted_iou),
-                'stability_score': float(stability_score),
-                'mask_shape': mask.shape,
-                # Convert mask to uint8 for storage efficiency
-                'mask': mask.astype(np.uint8)
-            }
+            features = []
+            start = 0
+            while start < len(inputs):
+                batch = torch.cat(inputs[start:start + self._encode_batch])
+                try:
+                    # Clone: a CUDA-graph compiled encoder reuses its output memory on the next replay
+                    features.extend(sam.image_encoder(batch).clone().split(1))
+                except torch.cuda.OutOfMemoryError:
+                    if self._encode_batch == 1:
+                        raise
+                    # Degrade gracefully: halve the batch and retry this chunk
+                    del batch
+                    torch.cuda.empty_cache()
+                    self._encode_batch //= 2
+                    print(f"   ⚠️  Out of GPU memory, reducing batch size to {self._encode_batch}")
+                    continue
+                start += len(batch)
+        
+        per_image = []
+        start = 0
+        for count in crops_per_image:
+            per_image.append(deque(zip(input_sizes[start:start + count], features[start:start + count])))
+            start += count
+        return per_image
+    
+    def _upload(self, image: np.ndarray, device: torch.device) -> torch.Tensor:
+        """Copy an HxWx3 uint8 image to the GPU through a reusable pinned staging buffer"""
+        if self._staging is None or self._staging.numel() < image.size:
+            self._staging = torch.empty(image.size, dtype=torch.uint8).pin_memory()
+            self._staging_done = None
+        elif self._staging_done is not None:
+            # The previous asynchronous copy must finish before the buffer is overwritten
+            self._staging_done.synchronize()
+        
+        staged = self._staging[:image.size].view(image.shape)
+        np.copyto(staged.numpy(), image)
+        uploaded = staged.to(device, non_blocking=True)
+        self._staging_done = torch.cuda.Event()
+        self._staging_done.record()
+        return uploaded
+    
+    def _process_masks(self, masks: List[Dict], image_filename: str) -> Dict[str, ObjectRecord]:
+        """Process masks and convert to storable format"""
+        print(f"   Processing {len(masks)} masks...")
+        
+        count = len(masks)
+        if count == 0:
+            return {}
+        
+        # Gather metadata into arrays once and derive everything in vectorized passes
+        bboxes = np.asarray([mask_data['bbox'] for mask_data in masks])  # [x, y, width, height]
+        areas = np.fromiter((mask_data['area'] for mask_data in masks), dtype=np.int64, count=count)
+        ious = np.fromiter((mask_data['predicted_iou'] for mask_data in masks), dtype=np.float64, count=count)
+        stabilities = np.fromiter((mask_data['stability_score'] for mask_data in masks), dtype=np.float64, count=count)
+        
+        centers = (bboxes[:, :2] + bboxes[:, 2:] / 2).astype(np.int64)
+        # Convert bbox to [x1, y1, x2, y2] format
+        bboxes_xyxy = np.concatenate([bboxes[:, :2], bboxes[:, :2] + bboxes[:, 2:]], axis=1)
         
-        # Sort by area (largest first) for better visualization
-        sorted_objects = dict(sorted(
-            processed_objects.items(), 
-            key=lambda x: x[1]['area'], 
-            reverse=True
-        ))
+        # Compact numbers: pixel boxes fit uint16, scores fit 8 bits
+        bboxes_list = np.clip(np.rint(bboxes_xyxy), 0, np.iinfo(np.uint16).max).astype(np.uint16).tolist()
+        centers_list = centers.tolist()
+        areas_list = areas.tolist()
+        ious_list = quantize_q8(ious).tolist()
+        stabilities_list = quantize_q8(stabilities).tolist()
+        
+        # Sort by area (largest first) for better visualization; IDs keep generation order
+        sorted_objects = {}
+        for i in np.argsort(-areas, kind='stable').tolist():
+            object_id = f"{image_filename}_obj_{i:04d}"
+            mask = masks[i]['segmentation']  # Boolean mask
+            sorted_objects[object_id] = ObjectRecord(
+                object_id=object_id,
+                bbox=bboxes_list[i],
+                area=areas_list[i],
+                center=centers_list[i],
+                iou_q8=ious_list[i],
+                stab_q8=stabilities_list[i],
+                mask_shape=mask.shape,
+                # COCO run-length encoding; object masks compress 10-50x
+                mask=maskUtils.encode(np.asfortranarray(mask, dtype=np.uint8))['counts']
+            )
         
         return sorted_objects
     
-    def process_image(self, image_path: str) -> bool:
+    def _load_image(self, image_path: str) -> Optional[np.ndarray]:
+        """Read an image from disk as contiguous RGB uint8"""
+        if IMREAD_COLOR_RGB is not None:
+            return cv2.imread(image_path, IMREAD_COLOR_RGB)
+        
+        image = cv2.imread(image_path)
+        if image is None:
+            return None
+        # Convert in place rather than allocating a second full-size buffer
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+    
+    def _output_file(self, image_path: str) -> Path:
+        """Segmentation output path for an image"""
+        image_name = os.path.splitext(os.path.basename(image_path))[0]
+        return self.output_dir / f"{image_name}_segmentation.msgpack"
+    
+    def process_image(self, image_path: str, image_rgb: Optional[np.ndarray] = None) -> bool:
         """Process a single image with SAM segmentation"""
+        writes = []
         try:
             image_filename = os.path.basename(image_path)
             image_name = os.path.splitext(image_filename)[0]
@@ -154,26 +488,27 @@ class ImagePreprocessor:
             print(f"\n🖼️  Processing: {image_filename}")
             
             # Check if already processed
-            output_file = self.output_dir / f"{image_name}_segmentation.pkl"
+            output_file = self._output_file(image_path)
             if output_file.exists():
                 print(f"   ⏭️  Already processed, skipping...")
                 return True
             
-            # Load image
-            image = cv2.imread(image_path)
-            if image is None:
+            # Load image as RGB
+            if image_rgb is None:
+                image_rgb = self._load_image(image_path)
+            if image_rgb is None:
                 print(f"   ❌ Failed to load image: {image_path}")
                 return False
             
-            # Convert to RGB
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             print(f"   📏 Image shape: {image_rgb.shape}")
             
+            self._ensure_sam()
+            
             # Generate masks
             print(f"   🔄 Running SAM segmentation (this may take 5-15 seconds)...")
             start_time = time.time()
             
-            masks = self.mask_generator.generate(image_rgb)
+            masks = self._generate(image_rgb)
             
             end_time = time.time()
             print(f"   ⏱️  Segmentation completed in {end_time - start_time:.2f} seconds")
@@ -182,9 +517,10 @@ class ImagePreprocessor:
             # Process and save masks
             processed_objects = self._process_masks(masks, image_name)
             
-            # Save processed data
-            with open(output_file, 'wb') as f:
-                pickle.dump(processed_objects, f)
+            # Save processed data in the background while the summary is built
+            writes.append(self._writer.submit(
+                _write_segmentation, output_file, list(processed_objects.values())
+            ))
             
             # Also save a JSON summary for easy inspection
             summary_file = self.output_dir / f"{image_name}_summary.json"
@@ -197,18 +533,24 @@ class ImagePreprocessor:
             }
             
             for obj_id, obj_data in processed_objects.items():
+                # Exact scores from SAM (the record only keeps 8-bit ones); IDs end in the mask index
+                mask_data = masks[int(obj_id.rsplit('_', 1)[1])]
                 summary_data['objects'].append({
                     'object_id': obj_id,
-                    'bbox': obj_data['bbox'],
-                    'area': obj_data['area'],
-                    'center': obj_data['center'],
-                    'predicted_iou': obj_data['predicted_iou'],
-                    'stability_score': obj_data['stability_score'],
-                    'mask_shape': obj_data['mask_shape']
+                    'bbox': obj_data.bbox,
+                    'area': obj_data.area,
+                    'center': obj_data.center,
+                    'predicted_iou': round(float(mask_data['predicted_iou']), 3),
+                    'stability_score': round(float(mask_data['stability_score']), 3),
+                    'mask_shape': obj_data.mask_shape
                 })
             
-            with open(summary_file, 'w') as f:
-                json.dump(summary_data, f, indent=2)
+            writes.append(self._writer.submit(_write_summary, summary_file, summary_data))
+            
+            # Surface any write errors here; wait for every write so no error goes unseen
+            errors = [error for error in (write.exception() for write in writes) if error is not None]
+            if errors:
+                raise errors[0]
             
             print(f"   ✅ Saved to: {output_file}")
             print(f"   📊 Summary: {summary_file}")
@@ -219,6 +561,10 @@ class ImagePreprocessor:
             print(f"   ❌ Error processing {image_path}: {e}")
             import traceback
             traceback.print_exc()
+            for write in writes:
+                error = write.exception()
+                if error is not None and error is not e:
+                    print(f"   ❌ Error writing results for {image_path}: {error}")
             return False
     
     def process_all_images(self, images_dir: str = "../pictures"):
@@ -241,6 +587,20 @@ class ImagePreprocessor:
             print(f"❌ No image files found in {images_dir}")
             return
         
+        # Skip images that already have results before loading anything
+        total_found = len(image_files)
+        image_files = [
+            image_file for image_file in image_files
+            if not self._output_file(str(image_file)).exists()
+        ]
+        if not image_files:
+            print(f"✅ All {total_found} images already processed, nothing to do")
+            return
+        
+        if total_found != len(image_files):
+            print(f"⏭️  Skipping {total_found - len(image_files)} already processed images")
+        self._ensure_sam()
+        
         print(f"🚀 Starting batch processing of {len(image_files)} images...")
         print(f"📁 Input directory: {images_path.absolute()}")
         print(f"📁 Output directory: {self.output_dir.absolute()}")
@@ -249,15 +609,53 @@ class ImagePreprocessor:
         failed = 0
         total_start_time = time.time()
         
-        for i, image_file in enumerate(image_files, 1):
-            print(f"\n{'='*60}")
-            print(f"Processing image {i}/{len(image_files)}")
-            
-            if self.process_image(str(image_file)):
-                successful += 1
-            else:
-                failed += 1
+        # Decode the next batches on a loader thread while the GPU works on the current one
+        batches = queue.Queue(maxsize=2)
+        loader = threading.Thread(
+            target=self._load_worker, args=(image_files, batches), daemon=True
+        )
+        loader.start()
         
+        i = 0
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                batch_files = [image_file for image_file, _ in batch]
+                batch_images = {image_file: image_rgb for image_file, image_rgb in batch if image_rgb is not None}
+                
+                # Encode every pending image of this batch in shared encoder passes
+                batch_features = {}
+                if batch_images:
+                    try:
+                        embeddings = self._precompute_embeddings(list(batch_images.values()))
+                        batch_features = dict(zip(batch_images, embeddings))
+                    except Exception as e:
+                        # Fall back to per-image encoding inside the generator
+                        print(f"   ⚠️  Batched encoding failed, encoding images one by one: {e}")
+                
+                for image_file in batch_files:
+                    i += 1
+                    print(f"\n{'='*60}")
+                    print(f"Processing image {i}/{len(image_files)}")
+                    
+                    self._pending_features = batch_features.pop(image_file, deque())
+                    try:
+                        ok = self.process_image(str(image_file), batch_images.pop(image_file, None))
+                    finally:
+                        # Never let one image's leftover embeddings reach the next
+                        self._pending_features = deque()
+                    
+                    if ok:
+                        successful += 1
+                    else:
+                        failed += 1
+        finally:
+            # Drain outstanding result writes before reporting
+            self._writer.shutdown(wait=True)
+        
+        loader.join()
         total_time = time.time() - total_start_time
         
         print(f"\n{'='*60}")
@@ -268,9 +666,22 @@ class ImagePreprocessor:
         print(f"📊 Average time per image: {total_time/len(image_files):.2f} seconds")
         print(f"📁 Results saved in: {self.output_dir.absolute()}")
     
-    def load_image_objects(self, image_name: str) -> Dict[str, Any]:
+    def _load_worker(self, image_files: List[Path], batches: queue.Queue):
+        """Producer: read pending images as RGB in batches; None marks the end"""
+        try:
+            group_size = self.batch_size
+            for batch_start in range(0, len(image_files), group_size):
+                batch = []
+                for image_file in image_files[batch_start:batch_start + group_size]:
+                    # Unreadable images are passed through as None
+                    batch.append((image_file, self._load_image(str(image_file))))
+                batches.put(batch)
+        finally:
+            batches.put(None)
+    
+    def load_image_objects(self, image_name: str) -> Dict[str, ObjectRecord]:
         """Load pre-processed objects for a given image"""
-        output_file = self.output_dir / f"{image_name}_segmentation.pkl"
+        output_file = self.output_dir / f"{image_name}_segmentation.msgpack"
         
         if not output_file.exists():
             print(f"❌ No pre-processed data found for {image_name}")
@@ -278,7 +689,8 @@ class ImagePreprocessor:
         
         try:
             with open(output_file, 'rb') as f:
-                objects = pickle.load(f)
+                records = msgspec.msgpack.decode(f.read(), type=List[ObjectRecord])
+            objects = {record.object_id: record for record in records}
             
             print(f"✅ Loaded {len(objects)} objects for {image_name}")
             return objects
@@ -290,6 +702,11 @@ class ImagePreprocessor:
 
 def main():
     """Main function to run the preprocessing"""
+    parser = argparse.ArgumentParser(description="Run SAM segmentation on all pictures")
+    parser.add_argument("--batch-size", type=int, default=4,
+                        help="Crops per image-encoder forward pass (halved automatically on OOM)")
+    args = parser.parse_args()
+    
     print("🎯 SAM Image Preprocessing Tool")
     print("="*60)
     
@@ -299,7 +716,7 @@ def main():
     
     try:
         # Initialize preprocessor
-        preprocessor = ImagePreprocessor()
+        preprocessor = ImagePreprocessor(batch_size=args.batch_size)
         
         # Process all images
         preprocessor.process_all_images()
@@ -3,18 +3,50 @@ Tobii Pro Fusion Eye Tracking Service
 Handles connection and real-time gaze data from Tobii Pro Fusion
 """
 import tobii_research as tr
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
 import time
 import threading
-from typing import Optional, Dict, List, Callable
+from typing import Optional, Dict, List, Tuple, Callable
 import json
 from dataclasses import dataclass
-from collections import deque
+import numpy as np
+import orjson
 
 
-@dataclass
+GAZE_BUFFER_SIZE = 100  # Keep last 100 gaze points
+GAZE_RING_SLOTS = GAZE_BUFFER_SIZE + 1  # One spare slot for the sample being written
+CALLBACK_DRAIN_INTERVAL = 0.016  # Deliver new samples to callbacks about once per display frame
+THREAD_CALLBACK_QUEUE_SIZE = 64  # Batches held for a thread that drains its own callbacks (~1 s)
+
+# Fields read from each sample when subscribed with as_dictionary=True
+_GAZE_KEYS = tuple(sys.intern(key) for key in (
+    'system_time_stamp',
+    'left_gaze_point_on_display_area',
+    'right_gaze_point_on_display_area',
+    'left_gaze_point_validity',
+    'right_gaze_point_validity'
+))
+
+# Messages from the Tobii and drain threads only enqueue a record; a listener thread
+# does the stdout write, so a slow or blocked pipe can't stall sample collection
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+log.propagate = False
+_log_queue = queue.SimpleQueue()
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flush queued messages on interpreter exit
+
+
+@dataclass(slots=True, frozen=True)
 class GazeData:
     """Structure for gaze data"""
-    timestamp: float
+    timestamp: float  # Wall-clock seconds, derived from the tracker's monotonic system clock
     left_eye_x: Optional[float]
     left_eye_y: Optional[float]
     right_eye_x: Optional[float]
@@ -26,14 +58,57 @@ class GazeData:
 
 
 class TobiiEyeTrackingService:
+    __slots__ = (
+        'eyetracker', 'is_connected', 'is_tracking',
+        '_ts', '_lx', '_ly', '_rx', '_ry', '_vl', '_vr',
+        '_write_idx', '_read_idx',
+        'current_image_path', 'gaze_callbacks', '_thread_callbacks', '_callbacks_lock',
+        '_drain_thread', '_drain_stop', '_drained_idx', '_dropped', '_debug_counter',
+        'screen_width', 'screen_height', '_t0', '_gaze_json'
+    )
+    
     def __init__(self):
         self.eyetracker: Optional[tr.EyeTracker] = None
         self.is_connected = False
         self.is_tracking = False
-        self.gaze_data_buffer = deque(maxlen=100)  # Keep last 100 gaze points
+        # Preallocated structure-of-arrays ring buffer of samples, one contiguous column per
+        # field; eye coordinates are normalized to the display area and readers scale them to pixels
+        self._ts = np.zeros(GAZE_RING_SLOTS, dtype=np.int64)  # Raw tracker system_time_stamp (µs)
+        self._lx = np.zeros(GAZE_RING_SLOTS, dtype=np.float32)
+        self._ly = np.zeros(GAZE_RING_SLOTS, dtype=np.float32)
+        self._rx = np.zeros(GAZE_RING_SLOTS, dtype=np.float32)
+        self._ry = np.zeros(GAZE_RING_SLOTS, dtype=np.float32)
+        self._vl = np.zeros(GAZE_RING_SLOTS, dtype=np.bool_)
+        self._vr = np.zeros(GAZE_RING_SLOTS, dtype=np.bool_)
+        # Lamport SPSC ring: the Tobii thread is the only producer. It writes a sample, then
+        # publishes it by storing _write_idx (total samples written) last; an int store is atomic
+        # under the GIL. _read_idx is the oldest sample still held; on overflow the producer drops
+        # the oldest by advancing it. Readers snapshot _write_idx once and never take a lock.
+        self._write_idx = 0
+        self._read_idx = 0
         self.current_image_path: Optional[str] = None
-        self.gaze_callbacks: List[Callable] = []
-        self._lock = threading.Lock()
+        # Immutable snapshot swapped on add/remove, so the drain thread iterates it without a lock
+        self.gaze_callbacks: Tuple[Callable, ...] = ()
+        # thread id -> (batch queue, callbacks) for callbacks that must run on a specific thread;
+        # replaced as a whole on add/remove like gaze_callbacks
+        self._thread_callbacks: Dict[int, Tuple[queue.Queue, Tuple[Callable, ...]]] = {}
+        self._callbacks_lock = threading.Lock()  # Serializes writers only
+        # Callbacks run on a drain thread, off the Tobii callback thread
+        self._drain_thread: Optional[threading.Thread] = None
+        self._drain_stop = threading.Event()
+        self._drained_idx = 0
+        self._dropped = 0  # Samples overwritten before they reached the callbacks
+        self._debug_counter = 0
+        
+        # Screen coordinates (assuming 1920x1080, adjust as needed)
+        self.screen_width = 1920
+        self.screen_height = 1080
+        
+        # Samples carry the tracker's monotonic system clock; seconds on it plus this offset give wall-clock time
+        self._t0 = 0.0
+        
+        # (cache key, encoded JSON) of the last gaze_data response, swapped as one tuple
+        self._gaze_json: tuple = (None, b"[]")
         
     def find_and_connect_eyetracker(self) -> bool:
         """Find and connect to Tobii Pro Fusion"""
@@ -68,7 +143,10 @@ class TobiiEyeTrackingService:
             
         try:
             print("🎯 Starting gaze data tracking...")
-            self.eyetracker.subscribe_to(tr.EYETRACKER_GAZE_DATA, self._gaze_data_callback)
+            self._t0 = time.time() - tr.get_system_time_stamp() * 1e-6
+            # Plain dicts: the SDK skips building nested GazeData objects per sample
+            self.eyetracker.subscribe_to(tr.EYETRACKER_GAZE_DATA, self._gaze_data_callback, as_dictionary=True)
+            self._start_drain()
             self.is_tracking = True
             print("✅ Gaze tracking started successfully")
             return True
@@ -85,6 +163,7 @@ class TobiiEyeTrackingService:
         try:
             print("⏸️ Stopping gaze data tracking...")
             self.eyetracker.unsubscribe_from(tr.EYETRACKER_GAZE_DATA, self._gaze_data_callback)
+            self._stop_drain()
             self.is_tracking = False
             print("✅ Gaze tracking stopped")
             return True
@@ -93,172 +172,282 @@ class TobiiEyeTrackingService:
             print(f"❌ Error stopping gaze tracking: {e}")
             return False
     
-    def _gaze_data_callback(self, gaze_data):
-        """Callback function for processing gaze data"""
+    def _gaze_data_callback(self, gaze_data, _isinstance=isinstance, _bool=bool, _map=map,
+                            _keys=_GAZE_KEYS, _N=GAZE_BUFFER_SIZE, _SLOTS=GAZE_RING_SLOTS):
+        """Callback function for processing gaze data (runs at the tracker sample rate)"""
+        # Builtins and module constants are bound as defaults so they load as fast locals
         try:
-            # Debug: Print raw gaze data occasionally
-            if hasattr(self, '_debug_counter'):
-                self._debug_counter += 1
-            else:
-                self._debug_counter = 1
+            debug_counter = self._debug_counter + 1
+            self._debug_counter = debug_counter
             
-            if self._debug_counter == 1:  # Print on first call to understand the format
-                print(f"🔍 Raw gaze data type: {type(gaze_data)}")
-                print(f"🔍 Raw gaze data attributes: {dir(gaze_data)}")
-                print(f"🔍 Raw gaze data sample: {gaze_data}")
-                
-                # Try to understand the structure
-                if hasattr(gaze_data, '__dict__'):
-                    print(f"🔍 Gaze data dict: {gaze_data.__dict__}")
+            # Debug: print the raw format of the first sample; stripped under python -O
+            if __debug__ and debug_counter == 1:
+                log.info("🔍 Raw gaze data type: %s", type(gaze_data))
+                log.info("🔍 Raw gaze data sample: %s", gaze_data)
             
             # Check if this is our own GazeData object (wrong callback)
-            if hasattr(gaze_data, 'timestamp') and hasattr(gaze_data, 'left_eye_x'):
-                print("⚠️ Received our own GazeData object - callback loop detected!")
+            if _isinstance(gaze_data, GazeData):
+                log.warning("⚠️ Received our own GazeData object - callback loop detected!")
                 return
             
-            # Extract gaze data from Tobii GazeData object format
-            try:
-                # Access the left_eye and right_eye attributes
-                left_eye_data = gaze_data.left_eye
-                right_eye_data = gaze_data.right_eye
-                
-                # Extract gaze point on display area and validity
-                left_eye_point = left_eye_data.gaze_point.position_on_display_area
-                right_eye_point = right_eye_data.gaze_point.position_on_display_area
-                left_validity = left_eye_data.gaze_point.validity
-                right_validity = right_eye_data.gaze_point.validity
-                
-                # Extract coordinates (should be tuples with (x, y))
-                left_eye = (left_eye_point[0], left_eye_point[1])
-                right_eye = (right_eye_point[0], right_eye_point[1])
-                
-                if self._debug_counter <= 3:  # Print first few samples to verify
-                    print(f"👁️ Left eye: {left_eye}, validity: {left_validity}")
-                    print(f"👁️ Right eye: {right_eye}, validity: {right_validity}")
-                
-            except (TypeError, AttributeError) as e:
-                print(f"❌ Failed to extract gaze data: {e}")
-                if hasattr(gaze_data, 'left_eye'):
-                    print(f"🔍 Left eye data: {gaze_data.left_eye}")
-                    if hasattr(gaze_data.left_eye, 'gaze_point'):
-                        print(f"🔍 Left gaze point: {gaze_data.left_eye.gaze_point}")
-                return
+            # Extract timestamp, gaze point on display area and validity in one pass; the SDK always
+            # sends these keys, so a malformed sample just falls through to the handler below
+            timestamp, left_eye, right_eye, left_valid, right_valid = _map(gaze_data.__getitem__, _keys)
+            left_valid = _bool(left_valid)
+            right_valid = _bool(right_valid)
             
-            # Convert to screen coordinates (assuming 1920x1080, adjust as needed)
-            screen_width = 1920
-            screen_height = 1080
+            if __debug__ and debug_counter <= 3:  # Print first few samples to verify
+                log.info("👁️ Left eye: %s, validity: %s", left_eye, left_valid)
+                log.info("👁️ Right eye: %s, validity: %s", right_eye, right_valid)
             
-            # Calculate screen coordinates
-            # Check if validity is True (not just truthy)
-            left_valid = left_validity == True
-            right_valid = right_validity == True
-            
-            left_x = left_eye[0] * screen_width if left_valid else None
-            left_y = left_eye[1] * screen_height if left_valid else None
-            right_x = right_eye[0] * screen_width if right_valid else None
-            right_y = right_eye[1] * screen_height if right_valid else None
-            
-            # Debug valid gaze points
-            if left_valid or right_valid:
-                if self._debug_counter % 50 == 0:  # Print every 50th valid sample
-                    print(f"👁️ Valid gaze: Left({left_x}, {left_y}) Right({right_x}, {right_y})")
+            # Store raw normalized coordinates in the ring buffer; scaling to screen
+            # coordinates happens in bulk when a reader asks for samples
+            head = self._write_idx
+            if head - self._read_idx >= _N:
+                # Full (the steady state, as HTTP readers don't consume): evict the oldest sample
+                self._read_idx = head - _N + 1
+            i = head % _SLOTS
+            self._ts[i] = timestamp
+            self._lx[i], self._ly[i] = left_eye
+            self._rx[i], self._ry[i] = right_eye
+            self._vl[i] = left_valid
+            self._vr[i] = right_valid
+            self._write_idx = head + 1
                     
-            # Create GazeData object with corrected validity flags
-            processed_gaze = GazeData(
-                timestamp=time.time(),
-                left_eye_x=left_x,
-                left_eye_y=left_y,
-                right_eye_x=right_x,
-                right_eye_y=right_y,
-                validity_left=left_valid,
-                validity_right=right_valid,
+        except Exception as e:
+            log.exception("❌ Error processing gaze data: %s", e)
+    
+    @staticmethod
+    def _window(head: int, count: int) -> Callable:
+        """A function reading the 'count' ring slots before 'head' from a column, oldest first"""
+        start = (head - count) % GAZE_RING_SLOTS
+        if start + count <= GAZE_RING_SLOTS:
+            # Common case (including the single latest sample): a contiguous view, no index array
+            return lambda column: column[start:start + count]
+        indices = np.arange(head - count, head)
+        return lambda column: np.take(column, indices, mode='wrap')
+    
+    def _columns(self, head: int, count: int) -> tuple:
+        """The 'count' samples before 'head', oldest first, as per-field lists in screen coordinates"""
+        take = self._window(head, count)
+        
+        # Scale and mask whole columns in one op each; invalid eyes come out as None
+        width, height = np.float64(self.screen_width), np.float64(self.screen_height)
+        vl, vr = take(self._vl), take(self._vr)
+        return (
+            (take(self._ts) * 1e-6 + self._t0).tolist(),
+            np.where(vl, take(self._lx) * width, None).tolist(),
+            np.where(vl, take(self._ly) * height, None).tolist(),
+            np.where(vr, take(self._rx) * width, None).tolist(),
+            np.where(vr, take(self._ry) * height, None).tolist(),
+            vl.tolist(),
+            vr.tolist()
+        )
+    
+    def _stable_columns(self, head: int, count: int) -> tuple:
+        """Like _columns, minus any samples the producer overwrote while they were being copied"""
+        columns = self._columns(head, count)
+        
+        # Overwritten (possibly torn) samples are dropped from the front
+        stale = self._write_idx - GAZE_RING_SLOTS + 1 - (head - count)
+        if stale > 0:
+            columns = tuple(column[stale:] for column in columns)
+        return columns
+    
+    def _gaze_batch(self, head: int, count: int) -> List[GazeData]:
+        """Build GazeData objects for the 'count' samples before 'head' (for registered callbacks)"""
+        screen_width = self.screen_width
+        screen_height = self.screen_height
+        return [
+            GazeData(
+                timestamp=ts,
+                left_eye_x=lx,
+                left_eye_y=ly,
+                right_eye_x=rx,
+                right_eye_y=ry,
+                validity_left=vl,
+                validity_right=vr,
                 screen_width=screen_width,
                 screen_height=screen_height
             )
+            for ts, lx, ly, rx, ry, vl, vr in zip(*self._stable_columns(head, count))
+        ]
+    
+    def _start_drain(self):
+        """Start the thread that delivers buffered samples to registered callbacks"""
+        self._drain_stop.clear()
+        # A thread that outlived a timed-out stop just keeps running
+        if self._drain_thread is not None and self._drain_thread.is_alive():
+            return
+        self._drained_idx = self._write_idx
+        self._drain_thread = threading.Thread(target=self._drain_loop, name="gaze-drain", daemon=True)
+        self._drain_thread.start()
+    
+    def _stop_drain(self):
+        """Stop the callback drain thread"""
+        self._drain_stop.set()
+        if self._drain_thread is not None:
+            self._drain_thread.join(timeout=1.0)
+            # Keep the reference while a slow callback holds it up, so it isn't started twice
+            if not self._drain_thread.is_alive():
+                self._drain_thread = None
+    
+    def _drain_loop(self):
+        """Hand samples published since the last pass to the callbacks, a frame's worth at a time"""
+        while not self._drain_stop.wait(CALLBACK_DRAIN_INTERVAL):
+            head = self._write_idx
+            # Skip anything the producer has already overwritten (or is overwriting)
+            drained = self._drained_idx
+            start = max(drained, head - GAZE_RING_SLOTS + 1)
+            self._drained_idx = head
+            callbacks = self.gaze_callbacks
+            thread_callbacks = self._thread_callbacks
+            if head <= start or not (callbacks or thread_callbacks):
+                continue
             
-            # Store in buffer
-            with self._lock:
-                self.gaze_data_buffer.append(processed_gaze)
+            # The ring wrapped past samples callbacks never saw; make that visible
+            skipped = start - drained
+            if skipped > 0:
+                self._dropped += skipped
+                log.warning("⚠️ Gaze callbacks fell behind, dropped %d samples", skipped)
             
-            # Call any registered callbacks
-            for callback in self.gaze_callbacks:
+            # Call any registered callbacks once with the whole batch
+            batch = self._gaze_batch(head, head - start)
+            self._dropped += head - start - len(batch)  # Overwritten while the batch was built
+            for callback in callbacks:
                 try:
-                    callback(processed_gaze)
+                    callback(batch)
                 except Exception as e:
-                    print(f"⚠️ Error in gaze callback: {e}")
-                    
-        except Exception as e:
-            print(f"❌ Error processing gaze data: {e}")
-            import traceback
-            traceback.print_exc()
+                    log.warning("⚠️ Error in gaze callback: %s", e)
+            
+            # Thread-bound callbacks just get the batch queued; a slow consumer never blocks this loop
+            for batches, _ in thread_callbacks.values():
+                try:
+                    batches.put_nowait(batch)
+                except queue.Full:
+                    self._dropped += len(batch)
+    
+    def drain_gaze_callbacks(self) -> int:
+        """Run the calling thread's gaze callbacks on the batches queued for it; returns the batch count"""
+        entry = self._thread_callbacks.get(threading.get_ident())
+        if entry is None:
+            return 0
+        batches, callbacks = entry
+        
+        drained = 0
+        while True:
+            try:
+                batch = batches.get_nowait()
+            except queue.Empty:
+                return drained
+            drained += 1
+            for callback in callbacks:
+                try:
+                    callback(batch)
+                except Exception as e:
+                    log.warning("⚠️ Error in gaze callback: %s", e)
     
     def get_latest_gaze_data(self, count: int = 1) -> List[Dict]:
         """Get the latest gaze data points"""
-        with self._lock:
-            if not self.gaze_data_buffer:
-                return []
-            
-            # Get the last 'count' items
-            latest_data = list(self.gaze_data_buffer)[-count:]
-            
-            # Convert to dictionaries for JSON serialization
-            return [
-                {
-                    'timestamp': gaze.timestamp,
-                    'left_eye_x': gaze.left_eye_x,
-                    'left_eye_y': gaze.left_eye_y,
-                    'right_eye_x': gaze.right_eye_x,
-                    'right_eye_y': gaze.right_eye_y,
-                    'validity_left': gaze.validity_left,
-                    'validity_right': gaze.validity_right,
-                    'screen_width': gaze.screen_width,
-                    'screen_height': gaze.screen_height
-                }
-                for gaze in latest_data
-            ]
+        head = self._write_idx  # Snapshot once; samples before it are fully written
+        count = min(count, head - self._read_idx)
+        if count <= 0:
+            return []
+        
+        columns = self._stable_columns(head, count)
+        
+        screen_width = self.screen_width
+        screen_height = self.screen_height
+        
+        # Convert to dictionaries for JSON serialization
+        return [
+            {
+                'timestamp': ts,
+                'left_eye_x': lx,
+                'left_eye_y': ly,
+                'right_eye_x': rx,
+                'right_eye_y': ry,
+                'validity_left': vl,
+                'validity_right': vr,
+                'screen_width': screen_width,
+                'screen_height': screen_height
+            }
+            for ts, lx, ly, rx, ry, vl, vr in zip(*columns)
+        ]
+    
+    def get_latest_gaze_json(self, count: int = 1) -> bytes:
+        """Get the latest gaze data points as encoded JSON, shared by pollers until a new sample arrives"""
+        key = (self._write_idx, count, self.screen_width, self.screen_height)
+        cached_key, cached = self._gaze_json
+        if cached_key == key:
+            return cached
+        
+        encoded = orjson.dumps(self.get_latest_gaze_data(count))
+        self._gaze_json = (key, encoded)
+        return encoded
+    
+    def get_recent_xy(self, count: int) -> np.ndarray:
+        """Get the latest gaze points as an (n, 2) float32 array of screen coordinates, oldest first"""
+        head = self._write_idx
+        count = min(count, head - self._read_idx)
+        if count <= 0:
+            return np.empty((0, 2), dtype=np.float32)
+        
+        # Average the valid eyes per sample in one pass over the columns; NaN where neither eye was valid
+        take = self._window(head, count)
+        vl, vr = take(self._vl), take(self._vr)
+        valid_eyes = vl.astype(np.float32) + vr
+        xy = np.empty((count, 2), dtype=np.float32)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xy[:, 0] = (np.where(vl, take(self._lx), 0) + np.where(vr, take(self._rx), 0)) / valid_eyes * self.screen_width
+            xy[:, 1] = (np.where(vl, take(self._ly), 0) + np.where(vr, take(self._ry), 0)) / valid_eyes * self.screen_height
+        
+        # Samples the producer overwrote while we were copying are dropped from the front
+        stale = self._write_idx - GAZE_RING_SLOTS + 1 - (head - count)
+        return xy[stale:] if stale > 0 else xy
+    
+    def _peek_last(self) -> Optional[tuple]:
+        """The newest sample with a valid eye as raw (ts, lx, ly, rx, ry, vl, vr) scalars, or None"""
+        head = self._write_idx
+        count = min(head - self._read_idx, GAZE_BUFFER_SIZE)
+        if count <= 0:
+            return None
+        
+        # Vectorized reverse scan for the newest sample with at least one valid eye
+        take = self._window(head, count)
+        valid_samples = np.flatnonzero(take(self._vl) | take(self._vr))
+        if not valid_samples.size:
+            return None
+        i = (head - count + int(valid_samples[-1])) % GAZE_RING_SLOTS
+        return (
+            self._ts[i].item() * 1e-6,
+            self._lx[i].item(), self._ly[i].item(),
+            self._rx[i].item(), self._ry[i].item(),
+            self._vl[i].item(), self._vr[i].item()
+        )
     
     def get_current_gaze_position(self) -> Optional[Dict]:
         """Get the most recent valid gaze position"""
-        latest_data = self.get_latest_gaze_data(1)
-        if not latest_data:
+        sample = self._peek_last()
+        if sample is None:
             return None
-            
-        gaze = latest_data[0]
+        ts, lx, ly, rx, ry, vl, vr = sample
         
-        # Check for valid data and non-None values
-        left_valid = (gaze['validity_left'] and 
-                     gaze['left_eye_x'] is not None and 
-                     gaze['left_eye_y'] is not None)
-        right_valid = (gaze['validity_right'] and 
-                      gaze['right_eye_x'] is not None and 
-                      gaze['right_eye_y'] is not None)
-        
-        # Use the better eye (or average if both valid)
-        if left_valid and right_valid:
-            # Both eyes valid - use average
-            x = (gaze['left_eye_x'] + gaze['right_eye_x']) / 2
-            y = (gaze['left_eye_y'] + gaze['right_eye_y']) / 2
-        elif left_valid:
-            # Only left eye valid
-            x = gaze['left_eye_x']
-            y = gaze['left_eye_y']
-        elif right_valid:
-            # Only right eye valid
-            x = gaze['right_eye_x']
-            y = gaze['right_eye_y']
-        else:
-            # No valid data
-            return None
+        # Average the valid eyes (or use the only valid one); plain floats beat NumPy for two values
+        valid_eyes = vl + vr
+        x = ((lx if vl else 0.0) + (rx if vr else 0.0)) / valid_eyes * self.screen_width
+        y = ((ly if vl else 0.0) + (ry if vr else 0.0)) / valid_eyes * self.screen_height
+        timestamp = ts + self._t0
         
         # Ensure coordinates are within reasonable bounds
-        if x < 0 or y < 0 or x > 3840 or y > 2160:  # Max reasonable screen size
+        if not (0 <= x <= 3840 and 0 <= y <= 2160):  # Max reasonable screen size
             print(f"⚠️ Gaze coordinates out of bounds: x={x}, y={y}")
             return None
         
         return {
             'x': round(x, 1),
             'y': round(y, 1),
-            'timestamp': gaze['timestamp']
+            'timestamp': timestamp
         }
     
     def set_image_context(self, image_path: str):
@@ -266,14 +455,40 @@ class TobiiEyeTrackingService:
         self.current_image_path = image_path
         print(f"🖼️ Image context set to: {image_path}")
     
-    def add_gaze_callback(self, callback: Callable):
-        """Add a callback function for real-time gaze data"""
-        self.gaze_callbacks.append(callback)
+    def add_gaze_callback(self, callback: Callable, thread_id: Optional[int] = None):
+        """Add a callback for real-time gaze data; it receives a list of GazeData, oldest first, about every 16 ms
+        
+        With a thread_id (threading.get_ident() of the target thread), batches are queued for that
+        thread instead, and its callbacks run when it calls drain_gaze_callbacks().
+        """
+        with self._callbacks_lock:
+            if thread_id is None:
+                self.gaze_callbacks = self.gaze_callbacks + (callback,)
+                return
+            batches, callbacks = self._thread_callbacks.get(
+                thread_id, (queue.Queue(maxsize=THREAD_CALLBACK_QUEUE_SIZE), ())
+            )
+            self._thread_callbacks = {**self._thread_callbacks, thread_id: (batches, callbacks + (callback,))}
     
     def remove_gaze_callback(self, callback: Callable):
         """Remove a gaze data callback"""
-        if callback in self.gaze_callbacks:
-            self.gaze_callbacks.remove(callback)
+        with self._callbacks_lock:
+            if callback in self.gaze_callbacks:
+                callbacks = list(self.gaze_callbacks)
+                callbacks.remove(callback)
+                self.gaze_callbacks = tuple(callbacks)
+                return
+            
+            for thread_id, (batches, callbacks) in self._thread_callbacks.items():
+                if callback in callbacks:
+                    thread_callbacks = dict(self._thread_callbacks)
+                    remaining = tuple(c for c in callbacks if c is not callback)
+                    if remaining:
+                        thread_callbacks[thread_id] = (batches, remaining)
+                    else:
+                        del thread_callbacks[thread_id]
+                    self._thread_callbacks = thread_callbacks
+                    return
     
     def get_status(self) -> Dict:
         """Get current status of the eye tracking service"""
@@ -283,7 +498,8 @@ class TobiiEyeTrackingService:
             'eyetracker_model': self.eyetracker.model if self.eyetracker else None,
             'device_name': self.eyetracker.device_name if self.eyetracker else None,
             'current_image': self.current_image_path,
-            'buffer_size': len(self.gaze_data_buffer) if self.gaze_data_buffer else 0
+            'buffer_size': self._write_idx - self._read_idx,
+            'dropped_samples': self._dropped
         }
     
     def disconnect(self):
@@ -293,16 +509,24 @@ class TobiiEyeTrackingService:
         
         self.eyetracker = None
         self.is_connected = False
-        self.gaze_data_buffer.clear()
+        self._write_idx = 0
+        self._read_idx = 0
+        self._drained_idx = 0
+        self._dropped = 0
+        self._gaze_json = (None, b"[]")  # Write indices restart, so cached keys would collide
         print("🔌 Disconnected from eye tracker")
 
 
 # Global instance
 _tobii_service = None
+_tobii_service_lock = threading.Lock()
 
 def get_tobii_eye_tracking_service() -> TobiiEyeTrackingService:
     """Get the global Tobii eye tracking service instance"""
     global _tobii_service
     if _tobii_service is None:
-        _tobii_service = TobiiEyeTrackingService()
+        # Double-checked so two first callers can't both construct (and subscribe) a service
+        with _tobii_service_lock:
+            if _tobii_service is None:
+                _tobii_service = TobiiEyeTrackingService()
     return _tobii_service